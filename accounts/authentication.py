@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+def user_cache_key(user_id):
+    return f'auth-user-fields:{user_id}'
+
+def invalidate_cached_user(sender, instance, using='default', **kwargs):
+    """
+    post_save/post_delete receiver for the user model. Runs after commit so a
+    concurrent request cannot re-cache the row as it was before the change.
+    """
+    transaction.on_commit(lambda: cache.delete(user_cache_key(instance.pk)), using=using)
+
+def cached_user_fields(user):
+    """
+    What CachedJWTAuthentication keeps per user: only the fields the token
+    checks need, never the password hash.
+    """
+    return {
+        'id': getattr(user, api_settings.USER_ID_FIELD),
+        'is_active': user.is_active,
+        'revoke': get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None,
+    }
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from the cache.
+
+    The cache holds the user's id, active flag and (with CHECK_REVOKE_TOKEN)
+    the password fingerprint for AUTH_USER_CACHE_TIMEOUT seconds, and cached
+    requests get an unsaved User(pk=..., is_active=...) built from them.
+    Entries are dropped whenever the user is saved or deleted, so
+    deactivation and password changes apply on the next request; writes that
+    bypass signals (queryset updates) are bounded by the timeout. Without a
+    shared cache an eviction would only reach one worker, so every request
+    loads the user instead.
+
+    With AUTH_LIGHTWEIGHT_USERS enabled, safe requests to views that set
+    lightweight_user = True get an unsaved User(pk=...) built from the token
+    and skip the user lookup entirely. Such views may only rely on
+    request.user.pk, and a deactivated user keeps read access to them until
+    their access token expires.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if self.allows_lightweight_user():
+            return self.user_model(**{api_settings.USER_ID_FIELD: user_id, 'is_active': True})
+
+        if not settings.SHARED_CACHE:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        fields = cache.get(key)
+        if fields is None:
+            user = super().get_user(validated_token)
+            cache.set(key, cached_user_fields(user), timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not fields['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != fields['revoke']:
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return self.user_model(**{api_settings.USER_ID_FIELD: fields['id'], 'is_active': fields['is_active']})
+
+    def authenticate(self, request):
+        self.request = request
+        return super().authenticate(request)
+
+    def allows_lightweight_user(self):
+        request = getattr(self, 'request', None)
+        if not settings.AUTH_LIGHTWEIGHT_USERS or request is None or request.method not in SAFE_METHODS:
+            return False
+        view = request.parser_context.get('view') if request.parser_context else None
+        return getattr(view, 'lightweight_user', False)
@@ -0,0 +1,86 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import User
+from accounts.purge import PURGE_CHUNK_SIZE, PURGE_MODELS, purge_user
+
+class Command(BaseCommand):
+    help = 'Delete users and everything they own in bounded chunks, without loading rows into memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'usernames',
+            nargs='*',
+            help='Usernames to purge',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            help='Also purge every user whose username starts with this prefix',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=PURGE_CHUNK_SIZE,
+            help=f'Rows deleted per statement (default: {PURGE_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--keep-users',
+            action='store_true',
+            help="Only delete the users' data and keep the accounts",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the rows that would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        if not options['usernames'] and not options['prefix']:
+            raise CommandError('Give at least one username or --prefix')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        users = User.objects.filter(username__in=options['usernames'])
+        if options['prefix']:
+            users |= User.objects.filter(username__startswith=options['prefix'])
+        users = list(users.filter(is_superuser=False).order_by('pk').values_list('pk', 'username'))
+
+        missing = set(options['usernames']) - {username for _, username in users}
+        for username in sorted(missing):
+            self.stdout.write(self.style.WARNING(f'User "{username}" not found or is a superuser, skipped'))
+        if not users:
+            self.stdout.write('Nothing to purge')
+            return
+
+        if options['dry_run']:
+            user_ids = [user_id for user_id, _ in users]
+            for model in PURGE_MODELS:
+                rows = model._base_manager.filter(user_id__in=user_ids).count()
+                self.stdout.write(f'{model._meta.label}: {rows} rows')
+            self.stdout.write(f'{len(users)} users would be purged')
+            return
+
+        # Every chunk commits on its own: re-run the same command to resume
+        # an interrupted purge.
+        started = time.monotonic()
+        total = 0
+        for index, (user_id, username) in enumerate(users, 1):
+            user_started = time.monotonic()
+            counts = {}
+            for model, deleted in purge_user(user_id, options['chunk_size'], options['keep_users']):
+                label = model._meta.label
+                counts[label] = counts.get(label, 0) + deleted
+                total += deleted
+                self.stdout.write(f'  {username}: deleted {counts[label]} {label} rows')
+
+            summary = ', '.join(f'{label} {rows}' for label, rows in counts.items()) or 'no rows'
+            self.stdout.write(
+                f'[{index}/{len(users)}] {username}: {summary} in {time.monotonic() - user_started:.2f}s'
+            )
+
+        elapsed = time.monotonic() - started
+        action = 'Cleared' if options['keep_users'] else 'Purged'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {len(users)} users, {total} rows in {elapsed:.2f}s '
+            f'({total / elapsed if elapsed else 0:.0f} rows/sec)'
+        ))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from accounts.purge import purge_users
 
 User = get_user_model()
 
@@ -17,7 +18,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         if options['clear']:
             self.stdout.write('Clearing existing users...')
-            User.objects.filter(is_superuser=False).delete()
+            purge_users(User.objects.filter(is_superuser=False).values_list('pk', flat=True))
 
         users_data = [
             {
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from budgets.models import Budget, BudgetAlert
+from helpers.cache import bump_data_version
+from jobs.models import Job
+from transactions.models import ArchivedTransaction, Category, MonthlyRollup, RecurringRule, Transaction
+from transactions.signals import send_transactions_changed
+from .authentication import user_cache_key
+from .models import User
+
+PURGE_CHUNK_SIZE = 5000
+
+# Children before parents, so every chunk can be deleted without the
+# cascade collector. Rules and jobs go first: they are what books new
+# transactions for a user while the purge runs.
+PURGE_MODELS = [
+    RecurringRule, Job,
+    Transaction, ArchivedTransaction, MonthlyRollup,
+    BudgetAlert, Budget,
+    Category,
+]
+
+def purge_rows(queryset, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Delete the rows of queryset chunk_size at a time and yield how many each
+    chunk removed.
+
+    Each chunk is a single DELETE ... WHERE pk IN (SELECT ... LIMIT n) in its
+    own transaction, so no rows are loaded, locks are held briefly and an
+    interrupted purge resumes where it stopped. Signals and cascades are
+    skipped; callers delete dependent rows first. Jobs are the exception and
+    go through the ORM so their files are removed.
+    """
+    model = queryset.model
+    using = queryset.db
+    chunk = queryset.order_by().values('pk')
+    while True:
+        rows = model._base_manager.using(using).filter(pk__in=chunk[:chunk_size])
+        if model is Job:
+            deleted = rows.delete()[0]
+        else:
+            deleted = rows._raw_delete(using)
+        if not deleted:
+            return
+        yield deleted
+
+def purge_user(user_id, chunk_size=PURGE_CHUNK_SIZE, keep_user=False):
+    """
+    Delete everything owned by a user in chunks, then the user unless
+    keep_user is set, yielding (model, rows deleted) per chunk.
+
+    The user is deactivated first so they cannot add rows mid-purge.
+    """
+    if not keep_user:
+        User.objects.filter(pk=user_id).update(is_active=False)
+        cache.delete(user_cache_key(user_id))
+
+    for model in PURGE_MODELS:
+        for deleted in purge_rows(model._base_manager.filter(user_id=user_id), chunk_size):
+            yield model, deleted
+
+    bump_data_version(user_id)
+    if not keep_user:
+        # Nothing is left to cascade to; delete() still fires the auth cache
+        # receiver and clears admin log entries.
+        deleted, _ = User.objects.filter(pk=user_id).delete()
+        if deleted:
+            yield User, 1
+
+def purge_users(user_ids, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Purge several users and return the rows deleted per model label.
+    """
+    totals = {}
+    for user_id in user_ids:
+        for model, deleted in purge_user(user_id, chunk_size):
+            totals[model._meta.label] = totals.get(model._meta.label, 0) + deleted
+    return totals
+
+def purge_transactions(user_id, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Delete a user's live and archived transactions and their rollups in
+    chunks, then re-evaluate budget alerts for the emptied months. Returns
+    the number of transactions deleted.
+    """
+    months = set(MonthlyRollup.objects.filter(user_id=user_id).values_list('user_id', 'year', 'month').distinct())
+    deleted = 0
+    for model in (Transaction, ArchivedTransaction, MonthlyRollup):
+        for rows in purge_rows(model._base_manager.filter(user_id=user_id), chunk_size):
+            if model is not MonthlyRollup:
+                deleted += rows
+    send_transactions_changed(months)
+    return deleted
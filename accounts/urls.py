@@ -1,9 +1,10 @@
 from django.urls import path
+from health.views import health_check
 from . import views
 
 urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
     path('profile/', views.profile, name='profile'),
-    path('check/', views.db_health_check, name='dbconnection')
+    path('check/', health_check, name='dbconnection')
 ]
\ No newline at end of file
@@ -3,9 +3,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from .models import User
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
-from django.db import connection
-from django.http import JsonResponse
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -38,14 +37,6 @@ def login(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def profile(request):
-    serializer = UserSerializer(request.user)
+    # request.user may be built from the auth cache with only pk and is_active.
+    serializer = UserSerializer(User.objects.get(pk=request.user.pk))
     return Response(serializer.data)
-
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def db_health_check(request):
-    try:
-        connection.ensure_connection()
-        return JsonResponse({"status": "connected"})
-    except Exception as e:
-        return JsonResponse({"status": "error", "detail": str(e)}, status=500)
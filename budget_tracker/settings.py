@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -29,17 +30,21 @@ INSTALLED_APPS = [
     'accounts',
     'transactions',
     'budgets',
+    'health',
+    'jobs',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'health.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'helpers.replicas.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,10 +70,41 @@ TEMPLATES = [
 WSGI_APPLICATION = 'budget_tracker.wsgi.application'
 
 # Database
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request) and checked before reuse when DB_CONN_HEALTH_CHECKS is set.
+# Behind PgBouncer in transaction mode, set DB_DISABLE_SERVER_SIDE_CURSORS.
+DATABASE_CONNECTION = {
+    'conn_max_age': config('DB_CONN_MAX_AGE', default=60, cast=int),
+    'conn_health_checks': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    'disable_server_side_cursors': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
+}
 DATABASES = {
-    'default': dj_database_url.parse(config('DATABASE_URL'))
+    'default': dj_database_url.parse(config('DATABASE_URL'), **DATABASE_CONNECTION)
 }
 
+# Read replicas (comma-separated URLs), registered as replica_1, replica_2, ...
+# Safe requests to views marked replica_reads read from a random replica
+# unless the user wrote within the last REPLICA_PIN_SECONDS.
+REPLICA_DATABASES = []
+for index, url in enumerate(filter(None, config('DATABASE_REPLICA_URLS', default='').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = dj_database_url.parse(url.strip(), **DATABASE_CONNECTION)
+    DATABASES[f'replica_{index}']['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASES.append(f'replica_{index}')
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+DATABASE_ROUTERS = ['helpers.replicas.ReplicaRouter']
+
+# In-process connection pool (PostgreSQL with psycopg 3 and psycopg[pool] only).
+# Pooled connections go back to the pool after each request, so they replace
+# persistent connections.
+if config('DB_POOL', default=False, cast=bool):
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,7 +137,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -115,6 +151,86 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# Read whole-month analytics from transactions.MonthlyRollup instead of raw transactions
+USE_MONTHLY_ROLLUPS = config('USE_MONTHLY_ROLLUPS', default=True, cast=bool)
+
+# Maximum number of items accepted by api/transactions/bulk/
+BULK_TRANSACTION_LIMIT = config('BULK_TRANSACTION_LIMIT', default=5000, cast=int)
+
+# Whole months older than this many months (before the current one) may be
+# moved to transactions.ArchivedTransaction by archive_transactions
+TRANSACTION_ARCHIVE_MONTHS = config('TRANSACTION_ARCHIVE_MONTHS', default=24, cast=int)
+
+# Cache (local memory by default; point CACHE_BACKEND/CACHE_LOCATION at Redis or memcached
+# so that every worker shares entries and invalidations)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='budget-tracker'),
+    }
+}
+
+# Whether every worker process sees the same cache entries. Invalidation by
+# data version only reaches other workers through a shared backend.
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Replica pins live in the cache; a pin set by one worker must reach the others
+if REPLICA_DATABASES and not SHARED_CACHE:
+    raise ImproperlyConfigured('DATABASE_REPLICA_URLS requires a shared CACHE_BACKEND such as Redis or memcached')
+
+# Per-user cache of summary and budget analysis responses, see helpers/cache.py
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=False, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=3600, cast=int)
+if RESPONSE_CACHE_ENABLED and not SHARED_CACHE:
+    raise ImproperlyConfigured('RESPONSE_CACHE_ENABLED requires a shared CACHE_BACKEND such as Redis or memcached')
+
+# Percentages of a budget at which budgets.BudgetAlert records are raised
+BUDGET_ALERT_THRESHOLDS = config('BUDGET_ALERT_THRESHOLDS', default='80,100', cast=lambda value: sorted(int(part) for part in value.split(',')))
+
+# Seconds a token's user stays cached by accounts.authentication.CachedJWTAuthentication
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
+# Let read-only views that opt in (lightweight_user = True) skip the user lookup entirely
+AUTH_LIGHTWEIGHT_USERS = config('AUTH_LIGHTWEIGHT_USERS', default=False, cast=bool)
+
+# Request metrics (api/health/metrics/, staff or Bearer METRICS_TOKEN only) and
+# slow-request logging, see health/middleware.py
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+SLOW_REQUEST_THRESHOLD_MS = config('SLOW_REQUEST_THRESHOLD_MS', default=500, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'health.requests': {
+            'handlers': ['console'],
+            'level': config('REQUEST_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+        'jobs': {
+            'handlers': ['console'],
+            'level': config('JOB_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Background jobs: where uploads and results are kept, how often workers
+# record a heartbeat for the job they run, and how long without one a running
+# job is considered abandoned by its worker and retried (up to JOB_MAX_ATTEMPTS)
+JOB_STORAGE_DIR = config('JOB_STORAGE_DIR', default=os.path.join(BASE_DIR, 'job_files'))
+JOB_HEARTBEAT_SECONDS = config('JOB_HEARTBEAT_SECONDS', default=30, cast=int)
+JOB_STALE_SECONDS = config('JOB_STALE_SECONDS', default=300, cast=int)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=3, cast=int)
+
 # JWT configuration
 from datetime import timedelta
 SIMPLE_JWT = {
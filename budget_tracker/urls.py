@@ -6,4 +6,6 @@ urlpatterns = [
     path('api/auth/', include('accounts.urls')),
     path('api/transactions/', include('transactions.urls')),
     path('api/budgets/', include('budgets.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/health/', include('health.urls')),
 ]
\ No newline at end of file
@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import Budget
+from .models import Budget, BudgetAlert
 
 @admin.register(Budget)
 class BudgetAdmin(admin.ModelAdmin):
     list_display = ['name', 'amount', 'category', 'user', 'month', 'year']
     list_filter = ['month', 'year', 'category']
-    search_fields = ['name', 'user__username']
\ No newline at end of file
+    search_fields = ['name', 'user__username']
+
+@admin.register(BudgetAlert)
+class BudgetAlertAdmin(admin.ModelAdmin):
+    list_display = ['budget', 'user', 'threshold', 'spent', 'budget_amount', 'triggered_at', 'cleared_at', 'acknowledged']
+    list_filter = ['threshold', 'acknowledged']
+    search_fields = ['budget__name', 'user__username']
\ No newline at end of file
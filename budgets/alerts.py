@@ -0,0 +1,90 @@
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from helpers.cache import bump_data_version
+from .models import Budget, BudgetAlert
+from .spending import expense_totals
+
+def crossed_thresholds(spent, amount):
+    if amount <= 0:
+        return set()
+    return {
+        threshold for threshold in settings.BUDGET_ALERT_THRESHOLDS
+        if spent * 100 >= amount * threshold
+    }
+
+def evaluate_user_alerts(user_id, periods):
+    """
+    Bring the alerts of one user's budgets in the given (year, month)
+    periods in line with current spending, using one budget query, one
+    grouped expense query and one alert query. Returns True if any alert
+    changed.
+    """
+    period_q = Q()
+    for year, month in periods:
+        period_q |= Q(year=year, month=month)
+    budgets = list(Budget.objects.filter(period_q, user_id=user_id))
+    if not budgets:
+        return False
+
+    spent_amounts = expense_totals(user_id, {(budget.year, budget.month) for budget in budgets})
+    alerts = {
+        (alert.budget_id, alert.threshold): alert
+        for alert in BudgetAlert.objects.select_for_update().filter(budget__in=budgets)
+    }
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for budget in budgets:
+        spent = Decimal(spent_amounts.get((budget.year, budget.month, budget.category_id), 0)).quantize(Decimal('0.01'))
+        crossed = crossed_thresholds(spent, budget.amount)
+        for threshold in settings.BUDGET_ALERT_THRESHOLDS:
+            alert = alerts.get((budget.id, threshold))
+            if threshold in crossed:
+                if alert is None:
+                    to_create.append(BudgetAlert(
+                        budget=budget, user_id=user_id, threshold=threshold,
+                        spent=spent, budget_amount=budget.amount, triggered_at=now
+                    ))
+                    continue
+                if alert.cleared_at is not None:
+                    alert.triggered_at, alert.cleared_at, alert.acknowledged = now, None, False
+                elif alert.spent == spent and alert.budget_amount == budget.amount:
+                    continue
+            elif alert is None or alert.cleared_at is not None:
+                continue
+            else:
+                alert.cleared_at = now
+            alert.spent, alert.budget_amount, alert.updated_at = spent, budget.amount, now
+            to_update.append(alert)
+
+    if to_create:
+        BudgetAlert.objects.bulk_create(to_create)
+    if to_update:
+        BudgetAlert.objects.bulk_update(
+            to_update, ['spent', 'budget_amount', 'triggered_at', 'cleared_at', 'acknowledged', 'updated_at']
+        )
+    return bool(to_create or to_update)
+
+def evaluate_budget_alerts(months):
+    """
+    Re-evaluate alerts for a set of (user_id, year, month) buckets.
+    """
+    by_user = {}
+    for user_id, year, month in months:
+        by_user.setdefault(user_id, set()).add((year, month))
+
+    for user_id, periods in by_user.items():
+        with transaction.atomic():
+            changed = evaluate_user_alerts(user_id, periods)
+        if changed:
+            bump_data_version(user_id)
+
+def transactions_changed_receiver(sender, months, **kwargs):
+    evaluate_budget_alerts(months)
+
+def budget_saved_receiver(sender, instance, using='default', **kwargs):
+    months = {(instance.user_id, instance.year, instance.month)}
+    transaction.on_commit(lambda: evaluate_budget_alerts(months), using=using)
@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 class BudgetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'budgets'
\ No newline at end of file
+    name = 'budgets'
+
+    def ready(self):
+        from helpers.cache import bump_owner_data_version
+        from transactions.signals import transactions_changed
+        from .alerts import budget_saved_receiver, transactions_changed_receiver
+        from .models import Budget, BudgetAlert
+
+        post_save.connect(bump_owner_data_version, sender=Budget)
+        post_delete.connect(bump_owner_data_version, sender=Budget)
+        post_save.connect(bump_owner_data_version, sender=BudgetAlert)
+        post_save.connect(budget_saved_receiver, sender=Budget)
+        transactions_changed.connect(transactions_changed_receiver)
\ No newline at end of file
@@ -19,4 +19,31 @@ class Budget(models.Model):
 
     def __str__(self):
         category_name = self.category.name if self.category else "Overall"
-        return f"{self.name} - {category_name} ({self.month}/{self.year})"
\ No newline at end of file
+        return f"{self.name} - {category_name} ({self.month}/{self.year})"
+
+class BudgetAlert(models.Model):
+    """
+    A budget's spending crossing one of BUDGET_ALERT_THRESHOLDS (percent of
+    the budgeted amount). Kept up to date by budgets.alerts on every
+    transaction or budget write; cleared_at is set while spending is back
+    below the threshold.
+    """
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='alerts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    threshold = models.IntegerField()
+    spent = models.DecimalField(max_digits=14, decimal_places=2)
+    budget_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    triggered_at = models.DateTimeField()
+    cleared_at = models.DateTimeField(null=True, blank=True)
+    acknowledged = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['budget', 'threshold']
+        ordering = ['-triggered_at']
+        indexes = [
+            models.Index(fields=['user', 'cleared_at', '-triggered_at'], name='budget_alert_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.budget} at {self.threshold}%"
\ No newline at end of file
@@ -1,8 +1,6 @@
 from rest_framework import serializers
-from .models import Budget
-from transactions.models import Transaction, Category
-from django.db.models import Sum
-from datetime import date
+from .models import Budget, BudgetAlert
+from .spending import expense_totals
 from helpers import CATEGEORY_ERRORS
 
 class BudgetSerializer(serializers.ModelSerializer):
@@ -20,24 +18,23 @@ class BudgetSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
 
+    def period_spending(self, obj):
+        spent_amounts = self.context.get('spent_amounts')
+        if spent_amounts is not None:
+            return spent_amounts
+
+        # Single-object responses fall back to one query per period, shared
+        # by spent/remaining/percentage.
+        if not hasattr(self, '_period_spending'):
+            self._period_spending = {}
+        period = (obj.user_id, obj.year, obj.month)
+        if period not in self._period_spending:
+            self._period_spending[period] = expense_totals(obj.user_id, [(obj.year, obj.month)])
+        return self._period_spending[period]
+
     def get_spent_amount(self, obj):
-        start_date = date(obj.year, obj.month, 1)
-        if obj.month == 12:
-            end_date = date(obj.year + 1, 1, 1)
-        else:
-            end_date = date(obj.year, obj.month + 1, 1)
-        
-        spent = Transaction.objects.filter(
-            user=obj.user,
-            type='expense',
-            date__gte=start_date,
-            date__lt=end_date
-        )
-        
-        if obj.category:
-            spent = spent.filter(category=obj.category)
-            
-        return float(spent.aggregate(total=Sum('amount'))['total'] or 0)
+        spent = self.period_spending(obj).get((obj.year, obj.month, obj.category_id), 0)
+        return float(spent)
 
     def get_remaining_amount(self, obj):
         spent = self.get_spent_amount(obj)
@@ -56,4 +53,23 @@ class BudgetSerializer(serializers.ModelSerializer):
     def validate_category(self, value):
         if value and value.user != self.context['request'].user:
             raise serializers.ValidationError(CATEGEORY_ERRORS.YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES)
-        return value
\ No newline at end of file
+        return value
+
+class BudgetAlertSerializer(serializers.ModelSerializer):
+    budget_name = serializers.CharField(source='budget.name', read_only=True)
+    category = serializers.IntegerField(source='budget.category_id', read_only=True)
+    category_name = serializers.CharField(source='budget.category.name', read_only=True, default=None)
+    month = serializers.IntegerField(source='budget.month', read_only=True)
+    year = serializers.IntegerField(source='budget.year', read_only=True)
+
+    class Meta:
+        model = BudgetAlert
+        fields = [
+            'id', 'budget', 'budget_name', 'category', 'category_name',
+            'month', 'year', 'threshold', 'spent', 'budget_amount',
+            'triggered_at', 'cleared_at', 'acknowledged', 'updated_at'
+        ]
+        read_only_fields = [
+            'budget', 'threshold', 'spent', 'budget_amount',
+            'triggered_at', 'cleared_at', 'updated_at'
+        ]
\ No newline at end of file
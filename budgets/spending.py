@@ -0,0 +1,56 @@
+from itertools import chain
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from helpers.periods import contiguous_runs, month_bounds, period_filter
+from transactions.archive import transaction_models
+from transactions.models import MonthlyRollup
+
+def expense_totals(user, periods):
+    """
+    Expense totals for a set of (year, month) periods in one grouped query
+    (one per table when raw reads reach the transaction archive).
+
+    Keys are (year, month, category_id); the all-category total used by
+    "Overall" budgets is stored under (year, month, None).
+    """
+    totals = {}
+    runs = contiguous_runs(periods)
+    if not runs:
+        return totals
+
+    if settings.USE_MONTHLY_ROLLUPS:
+        rollup_filter = Q()
+        for first, last in runs:
+            rollup_filter |= period_filter(first, last)
+        rows = MonthlyRollup.objects.filter(
+            rollup_filter,
+            user=user,
+            type='expense'
+        ).values('year', 'month', 'category_id', 'total')
+    else:
+        date_filter = Q()
+        for first, last in runs:
+            date_filter |= Q(date__gte=month_bounds(*first)[0], date__lt=month_bounds(*last)[1])
+        rows = chain.from_iterable(
+            model.objects.filter(
+                date_filter,
+                user=user,
+                type='expense'
+            ).annotate(
+                year=ExtractYear('date'),
+                month=ExtractMonth('date')
+            ).values('year', 'month', 'category_id').annotate(
+                total=Sum('amount')
+            ).order_by()
+            for model in transaction_models(month_bounds(*runs[0][0])[0])
+        )
+
+    for row in rows:
+        total = row['total'] or 0
+        key = (row['year'], row['month'], row['category_id'])
+        totals[key] = totals.get(key, 0) + total
+        overall_key = (row['year'], row['month'], None)
+        totals[overall_key] = totals.get(overall_key, 0) + total
+
+    return totals
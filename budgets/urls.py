@@ -5,4 +5,6 @@ urlpatterns = [
     path('', views.BudgetListCreateView.as_view(), name='budget-list'),
     path('<int:pk>/', views.BudgetDetailView.as_view(), name='budget-detail'),
     path('analysis/', views.budget_analysis, name='budget-analysis'),
+    path('alerts/', views.BudgetAlertListView.as_view(), name='budget-alert-list'),
+    path('alerts/<int:pk>/', views.BudgetAlertDetailView.as_view(), name='budget-alert-detail'),
 ]
\ No newline at end of file
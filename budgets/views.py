@@ -3,81 +3,180 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum
 from datetime import date
-from .models import Budget
-from .serializers import BudgetSerializer
-from transactions.models import Transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Budget, BudgetAlert
+from .serializers import BudgetAlertSerializer, BudgetSerializer
+from .spending import expense_totals
+from helpers.cache import ConditionalGetMixin, cached_response, conditional_get
+from helpers.periods import months_between, period_filter
+from helpers.replicas import replica_reads
+from helpers import BUDGET_ERRORS
 
-class BudgetListCreateView(generics.ListCreateAPIView):
+class BudgetListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = BudgetSerializer
     permission_classes = [IsAuthenticated]
+    lightweight_user = True
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['month', 'year', 'category']
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user)
+        return Budget.objects.filter(user=self.request.user).select_related('category')
 
-class BudgetDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        budgets = page if page is not None else list(queryset)
+
+        context = self.get_serializer_context()
+        context['spent_amounts'] = expense_totals(
+            request.user, {(budget.year, budget.month) for budget in budgets}
+        )
+        serializer = self.get_serializer(budgets, many=True, context=context)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+class BudgetDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BudgetSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user)
+        return Budget.objects.filter(user=self.request.user).select_related('category')
+
+class BudgetAlertListView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Threshold alerts for the user's budgets, newest first. ?status=active
+    (default), cleared or all; ?since=<ISO datetime> returns only alerts
+    changed after that time, for cheap polling.
+    """
+    serializer_class = BudgetAlertSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['threshold', 'acknowledged', 'budget']
+
+    def get_queryset(self):
+        queryset = BudgetAlert.objects.filter(user=self.request.user).select_related('budget__category')
+
+        alert_status = self.request.query_params.get('status', 'active')
+        if alert_status == 'active':
+            queryset = queryset.filter(cleared_at__isnull=True)
+        elif alert_status == 'cleared':
+            queryset = queryset.filter(cleared_at__isnull=False)
+
+        try:
+            since = parse_datetime(self.request.query_params.get('since', ''))
+        except ValueError:
+            since = None
+        if since:
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            queryset = queryset.filter(updated_at__gt=since)
+
+        return queryset
+
+class BudgetAlertDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
+    """
+    Fetch an alert or mark it as acknowledged.
+    """
+    serializer_class = BudgetAlertSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return BudgetAlert.objects.filter(user=self.request.user).select_related('budget__category')
+
+BUDGET_ANALYSIS_MAX_MONTHS = 60
 
+def parse_period(value):
+    year, month = (int(part) for part in value.split('-'))
+    if not 1 <= month <= 12:
+        raise ValueError(value)
+    return year, month
+
+def build_budget_analysis(user, periods):
+    """
+    Budget vs. actual for each (year, month) in periods, using one budget
+    query and one grouped expense query however many months are requested.
+    """
+    periods = sorted(periods)
+    budgets = Budget.objects.filter(
+        period_filter(periods[0], periods[-1]),
+        user=user
+    ).select_related('category').order_by('year', 'month', 'id')
+    spent_amounts = expense_totals(user, periods)
+
+    budgets_by_period = {period: [] for period in periods}
+    for budget in budgets:
+        budgets_by_period[(budget.year, budget.month)].append(budget)
+
+    analysis = []
+    for year, month in periods:
+        total_budgeted = 0
+        total_spent = spent_amounts.get((year, month, None), 0)
+        
+        budget_comparison = []
+        for budget in budgets_by_period[(year, month)]:
+            total_budgeted += budget.amount
+            category_spent = spent_amounts.get((year, month, budget.category_id), 0)
+            
+            budget_comparison.append({
+                'budget_id': budget.id,
+                'budget_name': budget.name,
+                'category': budget.category.name if budget.category else 'Overall',
+                'budgeted_amount': float(budget.amount),
+                'spent_amount': float(category_spent),
+                'remaining_amount': float(budget.amount) - float(category_spent),
+                'percentage_used': round((float(category_spent) / float(budget.amount)) * 100, 2) if budget.amount > 0 else 0,
+                'over_budget': float(category_spent) > float(budget.amount)
+            })
+        
+        analysis.append({
+            'period': {
+                'month': month,
+                'year': year
+            },
+            'summary': {
+                'total_budgeted': float(total_budgeted),
+                'total_spent': float(total_spent),
+                'total_remaining': float(total_budgeted) - float(total_spent),
+                'overall_percentage': round((float(total_spent) / float(total_budgeted)) * 100, 2) if total_budgeted > 0 else 0
+            },
+            'budget_comparison': budget_comparison
+        })
+
+    return analysis
+
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get
+@cached_response('budget_analysis')
 def budget_analysis(request):
     user = request.user
-    
     today = date.today()
-    month = int(request.GET.get('month', today.month))
-    year = int(request.GET.get('year', today.year))
-    
-    budgets = Budget.objects.filter(user=user, month=month, year=year)
-    
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
-    
-    expenses = Transaction.objects.filter(
-        user=user,
-        type='expense',
-        date__gte=start_date,
-        date__lt=end_date
-    )
-    
-    total_budgeted = budgets.aggregate(total=Sum('amount'))['total'] or 0
-    total_spent = expenses.aggregate(total=Sum('amount'))['total'] or 0
-    
-    budget_comparison = []
-    for budget in budgets:
-        category_expenses = expenses.filter(category=budget.category) if budget.category else expenses
-        category_spent = category_expenses.aggregate(total=Sum('amount'))['total'] or 0
-        
-        budget_comparison.append({
-            'budget_id': budget.id,
-            'budget_name': budget.name,
-            'category': budget.category.name if budget.category else 'Overall',
-            'budgeted_amount': float(budget.amount),
-            'spent_amount': float(category_spent),
-            'remaining_amount': float(budget.amount) - float(category_spent),
-            'percentage_used': round((float(category_spent) / float(budget.amount)) * 100, 2) if budget.amount > 0 else 0,
-            'over_budget': float(category_spent) > float(budget.amount)
-        })
-    
-    return Response({
-        'period': {
-            'month': month,
-            'year': year
-        },
-        'summary': {
-            'total_budgeted': float(total_budgeted),
-            'total_spent': float(total_spent),
-            'total_remaining': float(total_budgeted) - float(total_spent),
-            'overall_percentage': round((float(total_spent) / float(total_budgeted)) * 100, 2) if total_budgeted > 0 else 0
-        },
-        'budget_comparison': budget_comparison
-    })
\ No newline at end of file
+    is_range = 'from' in request.GET or 'to' in request.GET
+
+    try:
+        if is_range:
+            start = parse_period(request.GET.get('from', f'{today.year}-{today.month}'))
+            end = parse_period(request.GET.get('to', f'{today.year}-{today.month}'))
+            periods = months_between(start, end)
+        else:
+            month = int(request.GET.get('month', today.month))
+            year = int(request.GET.get('year', today.year))
+            periods = [parse_period(f'{year}-{month}')]
+    except ValueError:
+        return Response({'error': BUDGET_ERRORS.INVALID_PERIOD}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not periods:
+        return Response({'error': BUDGET_ERRORS.INVALID_PERIOD}, status=status.HTTP_400_BAD_REQUEST)
+    if len(periods) > BUDGET_ANALYSIS_MAX_MONTHS:
+        return Response({'error': BUDGET_ERRORS.PERIOD_RANGE_TOO_LONG}, status=status.HTTP_400_BAD_REQUEST)
+
+    analysis = build_budget_analysis(user, periods)
+
+    if is_range:
+        return Response({'results': analysis})
+    return Response(analysis[0])
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+class HealthConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'health'
+
+    def ready(self):
+        from .database import record_connection
+
+        connection_created.connect(record_connection)
@@ -0,0 +1,46 @@
+import time
+from django.db import connections
+from .metrics import connections_opened, registry
+
+def record_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver stamping each new connection with its open
+    time. With a pool this fires on every checkout rather than per socket.
+    """
+    connection.health_opened_at = time.monotonic()
+    with registry.lock:
+        connections_opened.inc((connection.alias,))
+
+def pool_status(connection):
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+    return dict(pool.get_stats(), min_size=pool.min_size, max_size=pool.max_size)
+
+def database_status(alias):
+    """
+    Round-trip a SELECT 1 on the alias and report its latency, whether the
+    request reused an already open connection, and how connections are kept.
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    status = {
+        'vendor': connection.vendor,
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'reused': connection.connection is not None,
+    }
+    try:
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        status['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    except Exception as e:
+        return dict(status, status='error', detail=str(e))
+
+    opened_at = getattr(connection, 'health_opened_at', None)
+    status['connection_age_seconds'] = round(time.monotonic() - opened_at, 1) if opened_at else None
+    status['connections_opened'] = connections_opened.values.get((alias,), 0)
+    status['pool'] = pool_status(connection)
+    return dict(status, status='ok')
@@ -0,0 +1,133 @@
+import threading
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+
+    def inc(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield self.name, zip(self.labelnames, labels), (), value
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.values = {}
+
+    def observe(self, labels, value):
+        state = self.values.get(labels)
+        if state is None:
+            state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self):
+        for labels, (counts, total, count) in sorted(self.values.items()):
+            label_pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket', label_pairs, (('le', format_value(bound)),), cumulative
+            yield f'{self.name}_sum', label_pairs, (), total
+            yield f'{self.name}_count', label_pairs, (), count
+
+class MetricsRegistry:
+    """
+    In-process metric store rendered in the Prometheus text format.
+
+    Values are per worker process; scrape each worker (or run a single
+    worker behind the scrape target) to see the full picture.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for metric in self.metrics:
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+                for name, labels, extra, value in metric.samples():
+                    lines.append(f'{name}{format_labels(labels, extra)} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            for metric in self.metrics:
+                metric.values.clear()
+
+registry = MetricsRegistry()
+
+requests_total = registry.register(Counter(
+    'http_requests_total', 'Requests by route, method and status code.',
+    ('view', 'method', 'status')
+))
+request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'Time spent producing the response.',
+    ('view', 'method'), LATENCY_BUCKETS
+))
+request_queries = registry.register(Histogram(
+    'http_request_db_queries', 'SQL queries executed per request.',
+    ('view', 'method'), QUERY_COUNT_BUCKETS
+))
+request_db_seconds = registry.register(Counter(
+    'http_request_db_seconds_total', 'Time spent in SQL queries.',
+    ('view', 'method')
+))
+response_size = registry.register(Histogram(
+    'http_response_size_bytes', 'Response body size; streaming responses are not included.',
+    ('view', 'method'), SIZE_BUCKETS
+))
+connections_opened = registry.register(Counter(
+    'db_connections_opened_total', 'Database connections opened by this process.',
+    ('alias',)
+))
+
+def record_request(view, method, status, duration, queries, db_seconds, size):
+    labels = (view, method)
+    with registry.lock:
+        requests_total.inc((view, method, str(status)))
+        request_duration.observe(labels, duration)
+        request_queries.observe(labels, queries)
+        request_db_seconds.inc(labels, db_seconds)
+        if size is not None:
+            response_size.observe(labels, size)
@@ -0,0 +1,88 @@
+import heapq
+import json
+import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .metrics import record_request
+
+logger = logging.getLogger('health.requests')
+
+MAX_LOGGED_QUERIES = 10
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook counting and timing every query.
+    """
+
+    def __init__(self, keep=MAX_LOGGED_QUERIES):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep = keep
+        # Min-heap of the slowest queries seen so far.
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            query = (elapsed, self.count, context['connection'].alias, sql)
+            if len(self.queries) < self.keep:
+                heapq.heappush(self.queries, query)
+            else:
+                heapq.heappushpop(self.queries, query)
+
+    def slowest(self):
+        return [
+            {'ms': round(elapsed * 1000, 2), 'db': alias, 'sql': sql}
+            for elapsed, _, alias, sql in sorted(self.queries, reverse=True)
+        ]
+
+def route_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.route or match.view_name
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL query count and time, response size and status for
+    every request under its URL route (e.g. "api/transactions/<int:pk>/"),
+    and logs requests slower than SLOW_REQUEST_THRESHOLD_MS together with
+    their slowest queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        view = route_label(request)
+        size = None if response.streaming else len(response.content)
+        record_request(view, request.method, response.status_code, duration, recorder.count, recorder.seconds, size)
+
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.get_full_path(),
+                'view': view,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'queries': recorder.count,
+                'db_ms': round(recorder.seconds * 1000, 2),
+                'slowest_queries': recorder.slowest(),
+            }))
+        return response
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.health_check, name='health'),
+    path('metrics/', views.metrics, name='metrics'),
+]
@@ -1,9 +1,33 @@
-from django.db import connection
-from django.http import JsonResponse
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from .database import database_status
+from .metrics import registry
 
-def db_health_check(request):
-    try:
-        connection.ensure_connection()
-        return JsonResponse({"status": "connected"})
-    except Exception as e:
-        return JsonResponse({"status": "error", "detail": str(e)}, status=500)
+def health_check(request):
+    """
+    Checks every configured database; responds 503 if any of them fails.
+    """
+    databases = {alias: database_status(alias) for alias in settings.DATABASES}
+    healthy = all(database['status'] == 'ok' for database in databases.values())
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'error', 'databases': databases},
+        status=200 if healthy else 503
+    )
+
+def metrics_allowed(request):
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_active and user.is_staff
+
+def metrics(request):
+    """
+    Prometheus text exposition of the request metrics, for staff users or
+    scrapers sending METRICS_TOKEN as "Authorization: Bearer <token>".
+    Without a configured token the endpoint is hidden from everyone else.
+    """
+    if not metrics_allowed(request):
+        return HttpResponse(status=403 if settings.METRICS_TOKEN else 404)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -5,4 +5,34 @@ class USER_ERRORS:
     MUST_INCLUDE_USERNAME_PASSWORD = "Must include username and password"
 
 class CATEGEORY_ERRORS:
-    YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES = "You can only use your own categories."
\ No newline at end of file
+    YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES = "You can only use your own categories."
+    MERGE_SOURCES_REQUIRED = "Give the categories to merge as a list of ids in 'sources'."
+    CATEGORY_NOT_FOUND = "Category not found."
+    MERGE_TARGET_IN_SOURCES = "The target category cannot also be a source."
+    MERGE_TYPE_MISMATCH = "Only categories of the same type can be merged."
+
+class TRANSACTION_ERRORS:
+    BULK_PAYLOAD_MUST_BE_A_LIST = "Expected a list of transactions."
+    BULK_LIMIT_EXCEEDED = "Too many transactions in one request."
+    ID_REQUIRED = "An id is required for each transaction."
+    TRANSACTION_NOT_FOUND = "Transaction not found."
+    IMPORT_FILE_REQUIRED = "Upload a CSV or OFX statement as 'file'."
+    UNSUPPORTED_IMPORT_FORMAT = "Supported import formats are csv and ofx."
+    UNREADABLE_IMPORT_FILE = "The file could not be read as a UTF-8 CSV statement; rows before the problem were imported."
+    UNSUPPORTED_EXPORT_FORMAT = "Supported export formats are csv and ndjson."
+    INVALID_TRENDS_INTERVAL = "interval must be one of day, week or month."
+    INVALID_DATE_RANGE = "Dates must be given as YYYY-MM-DD with start_date on or before end_date."
+    TOO_MANY_TREND_BUCKETS = "Too many buckets requested; use a shorter range or a larger interval."
+    RECURRING_END_BEFORE_START = "end_date must be on or after start_date."
+
+class BUDGET_ERRORS:
+    INVALID_PERIOD = "Periods must be given as month/year or as from/to in YYYY-MM format."
+    PERIOD_RANGE_TOO_LONG = "Budget analysis is limited to 60 months per request."
+
+class JOB_ERRORS:
+    PARAMS_MUST_BE_AN_OBJECT = "params must be a JSON object."
+    JOB_NOT_FOUND = "Job not found."
+    JOB_NOT_FINISHED = "The job has not finished yet."
+    JOB_IS_RUNNING = "Running jobs cannot be deleted."
+    PERIOD_RANGE_REVERSED = "The from month must not be after the to month."
+    PERIOD_RANGE_TOO_LONG = "Budget analysis jobs are limited to 600 months."
@@ -0,0 +1,201 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from urllib.parse import urlencode
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from helpers.replicas import pin_to_primary
+
+CACHED_ENDPOINTS = []
+
+def data_version_key(user_id):
+    return f'data-version:{user_id}'
+
+def data_version(user_id):
+    """
+    Current cache version token for a user's data.
+
+    Versions are random tokens rather than counters, so a version lost to
+    eviction or a cache restart can never come back and revive old entries.
+    """
+    key = data_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+def bump_data_version(*user_ids):
+    """
+    Invalidate every cached response for the given users and pin their reads
+    to the primary, so a replica that has not caught up yet cannot be read
+    and cached under the new version.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        cache.set_many({data_version_key(user_id): uuid4().hex for user_id in user_ids}, timeout=None)
+        pin_to_primary(*user_ids)
+
+def bump_owner_data_version(sender, instance, using='default', **kwargs):
+    """
+    post_save/post_delete receiver for models with a user foreign key.
+    """
+    transaction.on_commit(lambda: bump_data_version(instance.user_id), using=using)
+
+def bump_transaction_data_versions(sender, months, **kwargs):
+    """
+    transactions_changed receiver.
+    """
+    bump_data_version(*{user_id for user_id, _, _ in months})
+
+def query_fingerprint(params):
+    items = sorted((key, value) for key in params for value in params.getlist(key))
+    return hashlib.md5(urlencode(items).encode()).hexdigest()
+
+def response_cache_key(endpoint, request):
+    # Defaults such as "this month" depend on today's date.
+    return ':'.join([
+        'response',
+        endpoint,
+        str(request.user.pk),
+        data_version(request.user.pk),
+        date.today().isoformat(),
+        query_fingerprint(request.query_params),
+    ])
+
+def stats_key(endpoint, outcome):
+    return f'response-cache-stats:{endpoint}:{outcome}'
+
+def record(endpoint, outcome):
+    key = stats_key(endpoint, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+def response_cache_stats():
+    """
+    {endpoint: {'hits', 'misses', 'hit_rate'}} for every cached endpoint.
+    """
+    stats = {}
+    for endpoint in CACHED_ENDPOINTS:
+        hits = cache.get(stats_key(endpoint, 'hits'), 0)
+        misses = cache.get(stats_key(endpoint, 'misses'), 0)
+        total = hits + misses
+        stats[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else None,
+        }
+    return stats
+
+def reset_response_cache_stats():
+    cache.delete_many([
+        stats_key(endpoint, outcome)
+        for endpoint in CACHED_ENDPOINTS
+        for outcome in ('hits', 'misses')
+    ])
+
+def cached_response(endpoint):
+    """
+    Cache a function view's successful responses per user and query string.
+
+    Entries are keyed by the user's data version, which is bumped whenever
+    their transactions, categories or budgets change, so a stale response is
+    never served; RESPONSE_CACHE_TIMEOUT only bounds how long unused entries
+    linger. Place it below @api_view so the view receives a DRF request.
+    """
+    CACHED_ENDPOINTS.append(endpoint)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return view(request, *args, **kwargs)
+
+            key = response_cache_key(endpoint, request)
+            data = cache.get(key)
+            if data is not None:
+                record(endpoint, 'hits')
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            record(endpoint, 'misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+def response_etag(request):
+    """
+    Strong ETag for a GET: the user's data version plus everything else the
+    representation depends on (URL, negotiated media type, today's date).
+    """
+    raw = '|'.join([
+        data_version(request.user.pk),
+        date.today().isoformat(),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+    ])
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = [value.removeprefix('W/') for value in parse_etags(header)]
+    return '*' in etags or etag in etags
+
+def conditional_response(request, respond):
+    """
+    Answer 304 Not Modified when If-None-Match carries the current ETag,
+    before respond() runs any query; otherwise tag the fresh 200 response.
+
+    Without a shared cache each worker has its own data versions, so another
+    worker could confirm a representation that has changed; responses are
+    then left untagged.
+    """
+    if not settings.SHARED_CACHE:
+        return respond()
+
+    etag = response_etag(request)
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = respond()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def conditional_get(view):
+    """
+    ETag support for function views; place it below @api_view.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return view(request, *args, **kwargs)
+        return conditional_response(request, lambda: view(request, *args, **kwargs))
+    return wrapper
+
+class ConditionalGetMixin:
+    """
+    ETag support for generic views' GET handler.
+    """
+
+    def get(self, request, *args, **kwargs):
+        handler = super().get
+        return conditional_response(request, lambda: handler(request, *args, **kwargs))
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+from django.db.models import Q
+
+def month_bounds(year, month):
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1)
+    else:
+        end_date = date(year, month + 1, 1)
+    return start_date, end_date
+
+def next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+def months_between(start, end):
+    period = start
+    periods = []
+    while period <= end:
+        periods.append(period)
+        period = next_month(*period)
+    return periods
+
+def whole_months(start_date, end_date):
+    """
+    (start, end) periods when [start_date, end_date] covers whole calendar
+    months exactly, otherwise None.
+    """
+    if start_date.day != 1 or (end_date + timedelta(days=1)).day != 1 or end_date < start_date:
+        return None
+    return (start_date.year, start_date.month), (end_date.year, end_date.month)
+
+def period_filter(start, end):
+    """
+    Filter for models with year/month columns falling in [start, end].
+    """
+    start_year, start_month = start
+    end_year, end_month = end
+    return (
+        (Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month)) &
+        (Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month))
+    )
+
+def contiguous_runs(periods):
+    """
+    Group (year, month) periods into runs of consecutive months, returned
+    as (first, last) pairs.
+    """
+    runs = []
+    for period in sorted(set(periods)):
+        if runs and next_month(*runs[-1][1]) == period:
+            runs[-1][1] = period
+        else:
+            runs.append([period, period])
+    return [tuple(run) for run in runs]
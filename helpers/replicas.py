@@ -0,0 +1,108 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+# Read routing state of the request being served, None outside replica views.
+current_reads = ContextVar('current_reads', default=None)
+
+def pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+def pin_to_primary(*user_ids):
+    """
+    Send the users' replica reads to the primary for REPLICA_PIN_SECONDS so
+    they read their own writes. Called by helpers.cache.bump_data_version,
+    which every write path goes through, from requests, jobs and commands
+    alike.
+    """
+    if settings.REPLICA_DATABASES and user_ids:
+        cache.set_many({pin_key(user_id): True for user_id in user_ids}, timeout=settings.REPLICA_PIN_SECONDS)
+
+def authenticated_user_id(request):
+    """
+    Id of the user DRF authenticated, without evaluating Django's lazy
+    session user (which would itself query the database).
+    """
+    user = request.__dict__.get('user')
+    if user is None or isinstance(user, LazyObject) or not user.is_authenticated:
+        return None
+    return user.pk
+
+def replica_reads(view):
+    """
+    Marks a function view as safe to serve from a replica. Class-based views
+    set replica_reads = True instead.
+    """
+    view.replica_reads = True
+    return view
+
+def reads_from_replica(view_func):
+    view_class = getattr(view_func, 'view_class', None)
+    return getattr(view_func, 'replica_reads', False) or getattr(view_class, 'replica_reads', False)
+
+class ReplicaReads:
+    """
+    Picks the read database for one request once its user is known: the
+    primary while the user is pinned after a write, otherwise one replica for
+    the whole request.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+
+    def read_alias(self):
+        if self.alias is None:
+            user_id = authenticated_user_id(self.request)
+            if user_id is None:
+                return None
+            # Set before the lookup so a database cache backend reads the primary.
+            self.alias = DEFAULT_DB_ALIAS
+            if not cache.get(pin_key(user_id)):
+                self.alias = random.choice(settings.REPLICA_DATABASES)
+        return self.alias
+
+class ReplicaRouter:
+    """
+    Sends reads from replica views to a replica and everything else to the
+    primary. Replicas are never migrated; they are expected to mirror the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        reads = current_reads.get()
+        if reads is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return reads.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.REPLICA_DATABASES
+
+class ReplicaRoutingMiddleware:
+    """
+    Enables replica reads for safe requests to views marked replica_reads.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_reads.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            current_reads.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.REPLICA_DATABASES and request.method in SAFE_METHODS and reads_from_replica(view_func):
+            current_reads.set(ReplicaReads(request))
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'user', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['user__username', 'error']
+    readonly_fields = ['created_at', 'started_at', 'heartbeat_at', 'finished_at']
@@ -0,0 +1,99 @@
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import get_context
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs.worker import init_worker_process, stopping, work
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Jobs run in parallel (default: 2)',
+        )
+        parser.add_argument(
+            '--pool',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run workers in threads or forked processes (default: thread)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when the queue is empty (default: 1.0)',
+        )
+        parser.add_argument(
+            '--shutdown-timeout',
+            type=float,
+            default=30.0,
+            help='Seconds to wait for running jobs after SIGINT/SIGTERM before abandoning them (default: 30)',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs',
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        if options['pool'] == 'process':
+            # Forked children must not share the parent's connections, and
+            # stop on an event the parent sets for them.
+            context = get_context('fork')
+            stop = context.Event()
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                concurrency, mp_context=context, initializer=init_worker_process, initargs=(stop,)
+            )
+        else:
+            stop = stopping
+            executor = ThreadPoolExecutor(concurrency)
+
+        # Finish the jobs in hand, then exit.
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        self.stdout.write(f'Starting {concurrency} {options["pool"]} workers')
+        started = time.monotonic()
+        futures = [
+            executor.submit(work, index, options['poll_interval'], options['burst'])
+            for index in range(concurrency)
+        ]
+        deadline = None
+        while True:
+            _, pending = wait(futures, timeout=1)
+            if not pending:
+                break
+            if stop.is_set():
+                deadline = deadline or time.monotonic() + options['shutdown_timeout']
+                if time.monotonic() >= deadline:
+                    self.abandon(executor, len(pending), options)
+        executor.shutdown()
+        processed = sum(future.result() for future in futures)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs in {elapsed:.2f}s'))
+
+    def abandon(self, executor, busy, options):
+        """
+        Exit without waiting for jobs still running after the shutdown
+        timeout. Their heartbeats stop with them, so another worker
+        requeues them after JOB_STALE_SECONDS.
+        """
+        self.stdout.write(self.style.WARNING(
+            f'{busy} workers still busy after {options["shutdown_timeout"]:.0f}s; '
+            f'their jobs will be retried once stale'
+        ))
+        if options['pool'] == 'process':
+            for process in list(executor._processes.values()):
+                process.kill()
+        self.stdout.flush()
+        # Pool threads cannot be interrupted and would be joined at exit.
+        os._exit(1)
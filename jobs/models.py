@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from .storage import job_storage
+
+class Job(models.Model):
+    """
+    A unit of background work, claimed and run by `manage.py run_worker`.
+    JSON results are stored in `result`; file results (exports) in
+    `result_file`.
+    """
+    KINDS = [
+        ('export', 'Transaction export'),
+        ('import', 'Statement import'),
+        ('budget_analysis', 'Budget analysis'),
+    ]
+    STATUSES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=30, choices=KINDS)
+    status = models.CharField(max_length=10, choices=STATUSES, default='queued')
+    params = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    input_file = models.FileField(upload_to='inputs/', storage=job_storage, blank=True)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    result_file = models.FileField(upload_to='results/', storage=job_storage, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched every JOB_HEARTBEAT_SECONDS while a worker runs the job.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Worker claim: oldest queued job first.
+            models.Index(fields=['status', 'created_at'], name='job_queue_idx'),
+            models.Index(fields=['user', '-created_at'], name='job_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,61 @@
+import json
+from django.urls import reverse
+from rest_framework import serializers
+from budgets.views import parse_period
+from helpers import BUDGET_ERRORS, JOB_ERRORS, TRANSACTION_ERRORS
+from transactions.exports import EXPORT_FORMATS
+from transactions.importers import detect_format
+from .models import Job
+from .tasks import budget_analysis_range_error
+
+class JobSerializer(serializers.ModelSerializer):
+    file = serializers.FileField(source='input_file', write_only=True, required=False)
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'status', 'params', 'file', 'result_url', 'error',
+            'attempts', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = ['status', 'error', 'attempts', 'created_at', 'started_at', 'finished_at']
+
+    def get_result_url(self, job):
+        if job.status != 'succeeded':
+            return None
+        url = reverse('job-result', args=[job.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def validate_params(self, value):
+        # Multipart submissions (imports) send params as a JSON string.
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                raise serializers.ValidationError(JOB_ERRORS.PARAMS_MUST_BE_AN_OBJECT)
+        if not isinstance(value, dict):
+            raise serializers.ValidationError(JOB_ERRORS.PARAMS_MUST_BE_AN_OBJECT)
+        return value
+
+    def validate(self, attrs):
+        kind, params = attrs['kind'], attrs.setdefault('params', {})
+        if kind == 'export':
+            if params.get('output', 'csv') not in EXPORT_FORMATS:
+                raise serializers.ValidationError({'params': TRANSACTION_ERRORS.UNSUPPORTED_EXPORT_FORMAT})
+        elif kind == 'import':
+            upload = attrs.get('input_file')
+            if upload is None:
+                raise serializers.ValidationError({'file': TRANSACTION_ERRORS.IMPORT_FILE_REQUIRED})
+            params['file_format'] = params.get('file_format') or detect_format(upload.name)
+            if params['file_format'] not in ('csv', 'ofx'):
+                raise serializers.ValidationError({'params': TRANSACTION_ERRORS.UNSUPPORTED_IMPORT_FORMAT})
+        elif kind == 'budget_analysis':
+            try:
+                start, end = parse_period(params['from']), parse_period(params['to'])
+            except (KeyError, TypeError, ValueError, AttributeError):
+                raise serializers.ValidationError({'params': BUDGET_ERRORS.INVALID_PERIOD})
+            error = budget_analysis_range_error(start, end)
+            if error:
+                raise serializers.ValidationError({'params': error})
+        return attrs
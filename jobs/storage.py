@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+def job_storage():
+    return FileSystemStorage(location=settings.JOB_STORAGE_DIR)
+
+def delete_job_files(sender, instance, **kwargs):
+    """
+    post_delete receiver removing a job's uploaded input and result file.
+    """
+    for field in (instance.input_file, instance.result_file):
+        if field:
+            field.delete(save=False)
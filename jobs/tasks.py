@@ -0,0 +1,69 @@
+import tempfile
+from django.core.files import File
+from django.test import RequestFactory
+from rest_framework.request import Request
+from budgets.views import BUDGET_ANALYSIS_MAX_MONTHS, build_budget_analysis, parse_period
+from helpers import JOB_ERRORS, TRANSACTION_ERRORS
+from helpers.periods import months_between
+from transactions.exports import export_file, export_stream
+from transactions.importers import UNREADABLE_FILE_ERRORS, TransactionImporter, read_rows
+from transactions.views import TransactionExportView
+
+def run_export(job):
+    """
+    Export with the same query parameters (filters, output, compress) as
+    GET /api/transactions/export/, written to the job's result file.
+    """
+    request = Request(RequestFactory().get('/', job.params))
+    request.user = job.user
+    view = TransactionExportView(request=request, format_kwarg=None, args=(), kwargs={})
+    output = job.params.get('output', 'csv')
+    compress = job.params.get('compress') == 'gzip'
+
+    size = 0
+    with tempfile.TemporaryFile() as buffer:
+        for piece in export_stream(view.export_querysets(), output, compress):
+            buffer.write(piece)
+            size += len(piece)
+        buffer.seek(0)
+        _, filename = export_file(output, compress)
+        job.result_file.save(filename, File(buffer), save=False)
+    return {'filename': filename, 'bytes': size}
+
+def run_import(job):
+    with job.input_file.open('rb') as stream:
+        importer = TransactionImporter(job.user, date_format=job.params.get('date_format'))
+        try:
+            stats = importer.run(read_rows(stream, job.params['file_format']))
+        except UNREADABLE_FILE_ERRORS as exc:
+            raise ValueError(f'{TRANSACTION_ERRORS.UNREADABLE_IMPORT_FILE} ({exc}; {importer.stats["imported"]} imported)')
+    job.input_file.delete(save=False)
+    return stats
+
+# Jobs run outside the request cycle, so they may cover ten times the range
+# of GET /api/budgets/analysis/ (50 years), but not an unbounded one.
+BUDGET_ANALYSIS_JOB_MAX_MONTHS = 10 * BUDGET_ANALYSIS_MAX_MONTHS
+
+def budget_analysis_range_error(start, end):
+    """
+    Why a budget analysis job cannot cover start..end, or None if it can.
+    """
+    if start > end:
+        return JOB_ERRORS.PERIOD_RANGE_REVERSED
+    if (end[0] - start[0]) * 12 + end[1] - start[1] >= BUDGET_ANALYSIS_JOB_MAX_MONTHS:
+        return JOB_ERRORS.PERIOD_RANGE_TOO_LONG
+    return None
+
+def run_budget_analysis(job):
+    start, end = parse_period(job.params['from']), parse_period(job.params['to'])
+    error = budget_analysis_range_error(start, end)
+    if error:
+        raise ValueError(error)
+    periods = months_between(start, end)
+    return {'results': build_budget_analysis(job.user, periods)}
+
+JOB_HANDLERS = {
+    'export': run_export,
+    'import': run_import,
+    'budget_analysis': run_budget_analysis,
+}
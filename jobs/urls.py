@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.JobListCreateView.as_view(), name='job-list'),
+    path('<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('<int:pk>/result/', views.job_result, name='job-result'),
+]
@@ -0,0 +1,56 @@
+from django.http import FileResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from helpers import JOB_ERRORS
+from .models import Job
+from .serializers import JobSerializer
+
+class JobListCreateView(generics.ListCreateAPIView):
+    """
+    Submit a job (202 Accepted) or list your jobs, newest first.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'kind']
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+class JobDetailView(generics.RetrieveDestroyAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
+
+    def destroy(self, request, *args, **kwargs):
+        if self.get_object().status == 'running':
+            return Response({'error': JOB_ERRORS.JOB_IS_RUNNING}, status=status.HTTP_409_CONFLICT)
+        return super().destroy(request, *args, **kwargs)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_result(request, pk):
+    job = Job.objects.filter(user=request.user, pk=pk).first()
+    if job is None:
+        return Response({'error': JOB_ERRORS.JOB_NOT_FOUND}, status=status.HTTP_404_NOT_FOUND)
+    if job.status == 'failed':
+        return Response({'error': job.error}, status=status.HTTP_409_CONFLICT)
+    if job.status != 'succeeded':
+        return Response({'error': JOB_ERRORS.JOB_NOT_FINISHED, 'status': job.status}, status=status.HTTP_409_CONFLICT)
+
+    if job.result_file:
+        return FileResponse(job.result_file.open('rb'), as_attachment=True, filename=job.result['filename'])
+    return Response(job.result)
@@ -0,0 +1,154 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+from .tasks import JOB_HANDLERS
+
+logger = logging.getLogger('jobs')
+
+# Queued jobs tried per claim when falling back to compare-and-swap.
+CLAIM_CANDIDATES = 10
+
+# Set by run_worker on SIGINT/SIGTERM; workers finish their current job and exit.
+# Process pool children replace it with an event shared with the parent.
+stopping = threading.Event()
+
+def init_worker_process(stop_event):
+    """
+    ProcessPoolExecutor initializer. The parent closes its connections
+    before the pool forks, and each child starts from closed connections as
+    well, so no database socket is shared between processes. Children stop
+    on the parent's event and leave SIGINT (sent to the whole process group
+    by Ctrl+C) to the parent.
+    """
+    global stopping
+    connections.close_all()
+    stopping = stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+
+def claim_job(worker_id):
+    """
+    Mark the oldest queued job as running for this worker and return it, or
+    None when the queue is empty.
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports it, so
+    concurrent workers never wait on each other. Elsewhere (SQLite) a job is
+    claimed by a conditional UPDATE that only one worker can win.
+    """
+    queued = Job.objects.filter(status='queued').order_by('created_at', 'pk')
+    now = timezone.now()
+    claimed = {
+        'status': 'running', 'started_at': now, 'heartbeat_at': now,
+        'worker': worker_id, 'attempts': F('attempts') + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pk = queued.select_for_update(skip_locked=True).values_list('pk', flat=True).first()
+            if pk is None:
+                return None
+            Job.objects.filter(pk=pk).update(**claimed)
+        return Job.objects.get(pk=pk)
+
+    for pk in queued.values_list('pk', flat=True)[:CLAIM_CANDIDATES]:
+        if queued.filter(pk=pk).update(**claimed):
+            return Job.objects.get(pk=pk)
+    return None
+
+@contextmanager
+def heartbeat(job, interval=None):
+    """
+    Touch job.heartbeat_at every interval (default JOB_HEARTBEAT_SECONDS)
+    seconds from a background thread while the block runs, so a long job is
+    never mistaken for one abandoned by a dead worker.
+    """
+    interval = settings.JOB_HEARTBEAT_SECONDS if interval is None else interval
+    done = threading.Event()
+
+    def beat():
+        try:
+            while not done.wait(interval):
+                try:
+                    Job.objects.filter(pk=job.pk, status='running', worker=job.worker).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except DatabaseError:
+                    logger.warning('Heartbeat of job %s failed', job.pk, exc_info=True)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f'job-{job.pk}-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+def run_job(job):
+    started = time.monotonic()
+    try:
+        with heartbeat(job):
+            job.result = JOB_HANDLERS[job.kind](job)
+        job.status = 'succeeded'
+    except Exception as e:
+        logger.exception('Job %s (%s) failed', job.pk, job.kind)
+        job.status, job.error = 'failed', f'{type(e).__name__}: {e}'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'input_file', 'result_file', 'error', 'finished_at'])
+    logger.info('Job %s (%s) %s in %.2fs', job.pk, job.kind, job.status, time.monotonic() - started)
+    return job
+
+def requeue_stale_jobs(stale_seconds=None, max_attempts=None):
+    """
+    Return running jobs whose worker died (no heartbeat for stale_seconds)
+    to the queue, or fail them once they used up max_attempts.
+    """
+    stale_seconds = settings.JOB_STALE_SECONDS if stale_seconds is None else stale_seconds
+    max_attempts = settings.JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    stale = Job.objects.filter(status='running', heartbeat_at__lt=timezone.now() - timedelta(seconds=stale_seconds))
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status='failed', error='Worker stopped before the job finished.', finished_at=timezone.now()
+    )
+    requeued = stale.update(status='queued', worker='')
+    return requeued, failed
+
+def work(index, poll_interval=1.0, burst=False):
+    """
+    Claim and run jobs until stopped (or, with burst, until the queue is
+    empty), returning jobs abandoned by dead workers to the queue every
+    JOB_HEARTBEAT_SECONDS. Runs in a pool thread or process; returns the
+    jobs processed.
+    """
+    worker_id = f'{socket.gethostname()}:{os.getpid()}:{index}'
+    processed = 0
+    next_requeue = time.monotonic()
+    try:
+        while not stopping.is_set():
+            if time.monotonic() >= next_requeue:
+                requeued, failed = requeue_stale_jobs()
+                if requeued or failed:
+                    logger.warning('Requeued %s and failed %s stale jobs', requeued, failed)
+                next_requeue = time.monotonic() + settings.JOB_HEARTBEAT_SECONDS
+            job = claim_job(worker_id)
+            if job is None:
+                if burst:
+                    break
+                stopping.wait(poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+    finally:
+        # Connections are per thread; don't leave this worker's open.
+        connections.close_all()
+    return processed
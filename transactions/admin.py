@@ -1,5 +1,21 @@
 from django.contrib import admin
-from .models import Category, Transaction
+from .models import ArchivedTransaction, Category, MonthlyRollup, RecurringRule, Transaction
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """
+    View-only admin for rows that are maintained by the rollup-aware
+    archive_transactions and rebuild_rollups commands and must not be
+    edited by hand.
+    """
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -12,4 +28,23 @@ class TransactionAdmin(admin.ModelAdmin):
     list_display = ['title', 'amount', 'type', 'category', 'user', 'date']
     list_filter = ['type', 'category', 'date']
     search_fields = ['title', 'description', 'user__username']
-    date_hierarchy = 'date'
\ No newline at end of file
+    date_hierarchy = 'date'
+
+@admin.register(ArchivedTransaction)
+class ArchivedTransactionAdmin(ReadOnlyAdmin):
+    list_display = ['title', 'amount', 'type', 'category', 'user', 'date', 'archived_at']
+    list_filter = ['type', 'date']
+    search_fields = ['title', 'description', 'user__username']
+    date_hierarchy = 'date'
+
+@admin.register(RecurringRule)
+class RecurringRuleAdmin(admin.ModelAdmin):
+    list_display = ['title', 'amount', 'type', 'category', 'user', 'frequency', 'interval', 'next_date', 'active']
+    list_filter = ['frequency', 'type', 'active']
+    search_fields = ['title', 'user__username']
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(ReadOnlyAdmin):
+    list_display = ['user', 'year', 'month', 'category', 'type', 'total', 'count']
+    list_filter = ['year', 'month', 'type']
+    search_fields = ['user__username', 'category__name']
\ No newline at end of file
@@ -1,5 +1,21 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
 
 class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'transactions'
\ No newline at end of file
+    name = 'transactions'
+
+    def ready(self):
+        from helpers.cache import bump_owner_data_version, bump_transaction_data_versions
+        from .models import Category, RecurringRule
+        from .rollups import category_deleted_receiver
+        from .search import install_search_vector
+        from .signals import transactions_changed
+
+        post_migrate.connect(install_search_vector, sender=self)
+        transactions_changed.connect(bump_transaction_data_versions)
+        post_save.connect(bump_owner_data_version, sender=Category)
+        post_delete.connect(bump_owner_data_version, sender=Category)
+        pre_delete.connect(category_deleted_receiver, sender=Category)
+        post_save.connect(bump_owner_data_version, sender=RecurringRule)
+        post_delete.connect(bump_owner_data_version, sender=RecurringRule)
\ No newline at end of file
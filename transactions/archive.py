@@ -0,0 +1,51 @@
+from datetime import date
+from django.conf import settings
+from django.db import transaction
+from helpers.cache import bump_data_version
+from .models import ArchivedTransaction, Transaction
+
+ARCHIVE_FIELDS = [
+    'id', 'title', 'description', 'amount', 'type', 'category_id',
+    'user_id', 'date', 'created_at', 'updated_at',
+]
+
+def archive_cutoff(months=None, today=None):
+    """
+    First day kept in the live table: the start of the month `months`
+    (default TRANSACTION_ARCHIVE_MONTHS) before the current one.
+    """
+    months = settings.TRANSACTION_ARCHIVE_MONTHS if months is None else months
+    today = today or date.today()
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+def transaction_models(start_date=None):
+    """
+    Models holding transactions dated start_date onwards; None means all time.
+    """
+    if start_date is None or start_date < archive_cutoff():
+        return [Transaction, ArchivedTransaction]
+    return [Transaction]
+
+def archive_batch(queryset, batch_size):
+    """
+    Move up to batch_size transactions from queryset into the archive in one
+    transaction and return how many were moved.
+
+    Archived rows keep counting in MonthlyRollup, so rollups are left alone:
+    _base_manager deletes without the rollup maintenance and change signals
+    of Transaction.objects.
+    """
+    with transaction.atomic():
+        rows = list(
+            Transaction._base_manager.filter(pk__in=queryset.values('pk')[:batch_size])
+            .select_for_update().order_by('pk').values(*ARCHIVE_FIELDS)
+        )
+        if not rows:
+            return 0
+        ArchivedTransaction.objects.bulk_create([ArchivedTransaction(**row) for row in rows])
+        Transaction._base_manager.filter(pk__in=[row['id'] for row in rows]).delete()
+        # Archived rows drop out of transaction lists.
+        user_ids = {row['user_id'] for row in rows}
+        transaction.on_commit(lambda: bump_data_version(*user_ids))
+    return len(rows)
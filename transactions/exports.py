@@ -0,0 +1,90 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from itertools import chain
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('date', 'date'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('type', 'type'),
+    ('amount', 'amount'),
+    ('category', 'category_id'),
+    ('category_name', 'category__name'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+def export_file(output, compress=False):
+    """
+    (content type, file name) of an export.
+    """
+    content_type, extension = EXPORT_FORMATS[output]
+    filename = f'transactions.{extension}'
+    if compress:
+        return 'application/gzip', f'{filename}.gz'
+    return content_type, filename
+
+def export_rows(querysets, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of up to chunk_size value tuples in EXPORT_COLUMNS order,
+    reading querysets one after another.
+
+    Rows come from .iterator(), which uses a server-side cursor on
+    PostgreSQL, so only one chunk is held in memory at a time. The category
+    name is read through the same join select_related('category') would use.
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    rows = chain.from_iterable(queryset.values_list(*lookups).iterator(chunk_size=chunk_size) for queryset in querysets)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def csv_stream(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for chunk in chunks:
+        writer.writerows([csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def ndjson_stream(chunks):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder()
+    for chunk in chunks:
+        yield ''.join(encoder.encode(dict(zip(names, row))) + '\n' for row in chunk)
+
+def gzip_stream(pieces):
+    compressor = zlib.compressobj(wbits=31)
+    for piece in pieces:
+        data = compressor.compress(piece.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_stream(querysets, output='csv', compress=False):
+    stream = csv_stream if output == 'csv' else ndjson_stream
+    pieces = stream(export_rows(querysets))
+    return gzip_stream(pieces) if compress else (piece.encode() for piece in pieces)
@@ -0,0 +1,286 @@
+import csv
+import hashlib
+import io
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.db import transaction
+from .archive import transaction_models
+from .models import Category, Transaction
+
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%d.%m.%Y', '%Y%m%d']
+DEFAULT_CATEGORY_NAMES = {'income': 'Imported Income', 'expense': 'Imported Expense'}
+MAX_REPORTED_ERRORS = 100
+# Largest value Transaction.amount (max_digits=10, decimal_places=2) can hold.
+MAX_AMOUNT = Decimal('99999999.99')
+# Raised while reading a file that is not valid UTF-8 CSV.
+UNREADABLE_FILE_ERRORS = (UnicodeDecodeError, csv.Error)
+
+CSV_COLUMNS = {
+    'date': ['date', 'posted', 'transaction date'],
+    'title': ['title', 'name', 'payee', 'merchant'],
+    'description': ['description', 'memo', 'notes'],
+    'amount': ['amount', 'value'],
+    'type': ['type'],
+    'category': ['category'],
+}
+
+class ImportRowError(ValueError):
+    pass
+
+def read_csv(stream, encoding='utf-8-sig'):
+    """
+    Yield (line_number, row) from a binary CSV stream one line at a time.
+
+    Columns are matched case-insensitively against CSV_COLUMNS; without a
+    type column, negative amounts are expenses and positive ones income.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding=encoding, newline=''))
+    headers = {name.strip().lower(): name for name in reader.fieldnames or []}
+    columns = {
+        field: next((headers[alias] for alias in aliases if alias in headers), None)
+        for field, aliases in CSV_COLUMNS.items()
+    }
+
+    for row in reader:
+        yield reader.line_num, {
+            field: (row.get(column) or '').strip() if column else ''
+            for field, column in columns.items()
+        }
+
+def read_ofx(stream, encoding='latin-1', chunk_size=64 * 1024):
+    """
+    Yield (number, row) for each <STMTTRN> in a binary OFX/QFX stream.
+
+    Handles both SGML (unclosed tags) and XML OFX, tokenising fixed-size
+    chunks so single-line files are not loaded whole.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, errors='replace')
+    tag_pattern = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+    buffer = ''
+    current = None
+    number = 0
+
+    while True:
+        chunk = text.read(chunk_size)
+        buffer += chunk
+        # Everything from the last '<' on may be an incomplete tag or value;
+        # keep it for the next chunk.
+        cut = buffer.rfind('<') if chunk else -1
+        if cut == -1:
+            cut = len(buffer)
+
+        for closing, tag, value in tag_pattern.findall(buffer[:cut]):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and current is not None:
+                    number += 1
+                    yield number, ofx_row(current)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+        buffer = buffer[cut:]
+        if not chunk:
+            break
+
+def ofx_row(fields):
+    amount = fields.get('TRNAMT', '')
+    return {
+        'date': fields.get('DTPOSTED', '')[:8],
+        'title': fields.get('NAME') or fields.get('PAYEE') or fields.get('MEMO', ''),
+        'description': fields.get('MEMO', ''),
+        'amount': amount,
+        'type': '',
+        'category': '',
+    }
+
+def dedupe_key(day, amount, title):
+    raw = f'{day.isoformat()}|{amount:.2f}|{title.strip().lower()}'.encode()
+    return hashlib.blake2b(raw, digest_size=8).digest()
+
+class TransactionImporter:
+    """
+    Import parsed rows for one user in fixed-size batches.
+
+    Each batch resolves category names (creating missing ones in one
+    insert), skips rows already stored by (date, amount, title) in the live
+    or archived table, and is
+    written with a single bulk_create in its own database transaction.
+
+    Duplicates are counted per key: the n-th occurrence in the file is
+    skipped only if at least n matching rows existed before the import, so
+    re-importing an overlapping statement adds nothing while genuinely
+    repeated rows within one file are kept.
+    """
+
+    def __init__(self, user, batch_size=1000, date_format=None):
+        self.user = user
+        self.batch_size = batch_size
+        self.date_formats = [date_format] if date_format else DATE_FORMATS
+        # (lowercased name, type) -> category, so an expense row never lands
+        # in an income category of the same name.
+        self.categories = {
+            (category.name.lower(), category.type): category
+            for category in Category.objects.filter(user=user)
+        }
+        # dedupe key -> [rows stored before this import, occurrences so far]
+        self.seen = {}
+        self.stats = {
+            'rows': 0,
+            'imported': 0,
+            'duplicates': 0,
+            'failed': 0,
+            'categories_created': 0,
+            'errors': [],
+        }
+
+    def run(self, rows, progress=None):
+        started = time.monotonic()
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+            if progress:
+                progress(self.stats)
+
+        elapsed = time.monotonic() - started
+        self.stats['seconds'] = round(elapsed, 3)
+        self.stats['rows_per_second'] = round(self.stats['rows'] / elapsed) if elapsed else self.stats['rows']
+        return self.stats
+
+    def parse_row(self, row):
+        try:
+            amount = Decimal(row['amount'].replace(',', '').replace('$', ''))
+        except InvalidOperation:
+            raise ImportRowError(f'Invalid amount "{row["amount"]}"')
+        if not amount.is_finite():
+            raise ImportRowError(f'Invalid amount "{row["amount"]}"')
+        # Checked before rounding too: quantize() fails on huge values.
+        if abs(amount) > MAX_AMOUNT or abs(amount).quantize(Decimal('0.01')) > MAX_AMOUNT:
+            raise ImportRowError(f'Amount "{row["amount"]}" exceeds {MAX_AMOUNT}')
+
+        for date_format in self.date_formats:
+            try:
+                day = datetime.strptime(row['date'], date_format).date()
+                break
+            except ValueError:
+                continue
+        else:
+            raise ImportRowError(f'Invalid date "{row["date"]}"')
+
+        transaction_type = row['type'].lower()
+        if transaction_type not in DEFAULT_CATEGORY_NAMES:
+            transaction_type = 'expense' if amount < 0 else 'income'
+
+        # PostgreSQL text columns cannot store NUL characters.
+        row = {field: value.replace('\x00', '') for field, value in row.items()}
+        title = row['title'][:200]
+        if not title:
+            raise ImportRowError('Missing title')
+
+        return {
+            'date': day,
+            'amount': abs(amount).quantize(Decimal('0.01')),
+            'type': transaction_type,
+            'title': title,
+            'description': row['description'],
+            'category_name': (row['category'] or DEFAULT_CATEGORY_NAMES[transaction_type])[:100],
+        }
+
+    def import_batch(self, batch):
+        parsed = []
+        for line, row in batch:
+            self.stats['rows'] += 1
+            try:
+                parsed.append(self.parse_row(row))
+            except ImportRowError as exc:
+                self.stats['failed'] += 1
+                if len(self.stats['errors']) < MAX_REPORTED_ERRORS:
+                    self.stats['errors'].append({'line': line, 'error': str(exc)})
+
+        if not parsed:
+            return
+
+        # Rows archived by archive_transactions count as stored too.
+        dates = {item['date'] for item in parsed}
+        stored = Counter(
+            dedupe_key(day, amount, title)
+            for model in transaction_models(min(dates))
+            for day, amount, title in model.objects.filter(
+                user=self.user,
+                date__in=dates
+            ).values_list('date', 'amount', 'title')
+        )
+
+        new_items = []
+        for item in parsed:
+            key = dedupe_key(item['date'], item['amount'], item['title'])
+            seen = self.seen.setdefault(key, [stored[key], 0])
+            seen[1] += 1
+            if seen[1] <= seen[0]:
+                self.stats['duplicates'] += 1
+                continue
+            new_items.append(item)
+
+        with transaction.atomic():
+            self.create_missing_categories(new_items)
+            created = Transaction.objects.bulk_create([
+                Transaction(
+                    user=self.user,
+                    category=self.categories[(item['category_name'].lower(), item['type'])],
+                    title=item['title'],
+                    description=item['description'],
+                    amount=item['amount'],
+                    type=item['type'],
+                    date=item['date'],
+                )
+                for item in new_items
+            ])
+        self.stats['imported'] += len(created)
+
+    def category_name(self, name, transaction_type, pending):
+        """
+        Name for a new category. Names are unique per user regardless of
+        type, so when only a category of the other type has this name (or is
+        about to be created with it) the new one gets the type appended,
+        e.g. "Salary (Expense)".
+        """
+        keys = [(name.lower(), other) for other in DEFAULT_CATEGORY_NAMES]
+        if not any(key in self.categories or key in pending for key in keys):
+            return name
+        suffix = f' ({transaction_type.title()})'
+        return name[:100 - len(suffix)] + suffix
+
+    def create_missing_categories(self, items):
+        missing = {}
+        for item in items:
+            key = (item['category_name'].lower(), item['type'])
+            if key in self.categories or key in missing:
+                continue
+            name = self.category_name(item['category_name'], item['type'], missing)
+            existing = self.categories.get((name.lower(), item['type']))
+            if existing is not None:
+                self.categories[key] = existing
+            else:
+                missing[key] = Category(user=self.user, name=name, type=item['type'])
+        if not missing:
+            return
+
+        for key, category in zip(missing, Category.objects.bulk_create(missing.values())):
+            self.categories[key] = category
+            self.categories[(category.name.lower(), category.type)] = category
+        self.stats['categories_created'] += len(missing)
+
+def detect_format(filename):
+    return 'ofx' if filename.lower().endswith(('.ofx', '.qfx')) else 'csv'
+
+def read_rows(stream, file_format):
+    return read_ofx(stream) if file_format == 'ofx' else read_csv(stream)
@@ -0,0 +1,64 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from transactions.archive import archive_batch, archive_cutoff
+from transactions.models import Transaction
+
+class Command(BaseCommand):
+    help = 'Move transactions older than the archive horizon into transactions.ArchivedTransaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=settings.TRANSACTION_ARCHIVE_MONTHS,
+            help=f'Whole months to keep live before the current one '
+                 f'(default: TRANSACTION_ARCHIVE_MONTHS, {settings.TRANSACTION_ARCHIVE_MONTHS})',
+        )
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only archive transactions of this username (default: all users)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Transactions moved per database transaction (default: 5000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the transactions that would be archived',
+        )
+
+    def handle(self, *args, **options):
+        # Readers only consult the archive for ranges starting before the
+        # configured cutoff, so rows newer than it must stay live.
+        if options['months'] < settings.TRANSACTION_ARCHIVE_MONTHS:
+            raise CommandError(
+                f'--months must be at least TRANSACTION_ARCHIVE_MONTHS ({settings.TRANSACTION_ARCHIVE_MONTHS})'
+            )
+
+        cutoff = archive_cutoff(options['months'])
+        queryset = Transaction._base_manager.filter(date__lt=cutoff).order_by('pk')
+        if options['user']:
+            queryset = queryset.filter(user__username=options['user'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} transactions dated before {cutoff} would be archived')
+            return
+
+        started = time.monotonic()
+        moved = 0
+        while True:
+            batch = archive_batch(queryset, options['batch_size'])
+            if not batch:
+                break
+            moved += batch
+            self.stdout.write(f'Archived {moved} transactions')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {moved} transactions dated before {cutoff} in {elapsed:.2f}s')
+        )
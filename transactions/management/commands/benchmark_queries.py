@@ -0,0 +1,185 @@
+import statistics
+import time
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from transactions.models import Category, Transaction
+
+User = get_user_model()
+
+BENCH_USER_PREFIX = 'bench_user_'
+
+class Command(BaseCommand):
+    help = 'Report EXPLAIN plans and timings for the main transaction queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generate',
+            action='store_true',
+            help='Create a synthetic dataset before benchmarking',
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100,
+            help='Number of synthetic users to generate (default: 100)',
+        )
+        parser.add_argument(
+            '--per-user',
+            type=int,
+            default=1000,
+            help='Transactions per synthetic user (default: 1000)',
+        )
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Username to benchmark against (default: the heaviest user)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Runs per query; the median is reported (default: 20)',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also run every query with the Transaction indexes dropped, inside a transaction that is '
+                 'rolled back (this locks the table; do not run it against a live database)',
+        )
+        parser.add_argument(
+            '--i-know',
+            action='store_true',
+            help='Allow --compare on databases without transactional DDL, where the indexes are really '
+                 'dropped and recreated',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Use EXPLAIN ANALYZE where the database supports it',
+        )
+
+    def handle(self, *args, **options):
+        if options['compare'] and not connection.features.can_rollback_ddl and not options['i_know']:
+            raise CommandError(
+                f'--compare would drop and recreate the Transaction indexes outside a transaction on '
+                f'{connection.vendor}. Use a scratch database and pass --i-know.'
+            )
+
+        if options['generate']:
+            self.generate(options['users'], options['per_user'])
+
+        user = self.pick_user(options['user'])
+        if user is None:
+            self.stdout.write(self.style.ERROR('No transactions to benchmark. Use --generate first.'))
+            return
+
+        self.stdout.write(f'Benchmarking against {user.username} '
+                          f'({Transaction.objects.filter(user=user).count()} transactions, '
+                          f'{Transaction.objects.count()} total)')
+
+        if options['compare']:
+            self.stdout.write(self.style.MIGRATE_HEADING('\nWithout composite indexes'))
+            if connection.features.can_rollback_ddl:
+                before = self.run_without_indexes(user, options)
+            else:
+                with connection.schema_editor() as editor:
+                    for index in Transaction._meta.indexes:
+                        editor.remove_index(Transaction, index)
+                try:
+                    before = self.run_queries(user, options)
+                finally:
+                    with connection.schema_editor() as editor:
+                        for index in Transaction._meta.indexes:
+                            editor.add_index(Transaction, index)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nWith composite indexes'))
+        after = self.run_queries(user, options)
+
+        if options['compare']:
+            self.stdout.write(self.style.MIGRATE_HEADING('\nSummary (median ms)'))
+            for name, timing in after.items():
+                speedup = before[name] / timing if timing else 0
+                self.stdout.write(f'{name:<32} {before[name]:>10.2f} {timing:>10.2f}  x{speedup:.1f}')
+
+    def run_without_indexes(self, user, options):
+        """
+        Drop the indexes, time the queries and roll everything back, so an
+        interrupted or failed run can never leave the table without them.
+        """
+        # The SQLite schema editor refuses to run inside atomic(), so the
+        # DROP INDEX statements are collected first and executed directly.
+        with connection.schema_editor(collect_sql=True) as editor:
+            for index in Transaction._meta.indexes:
+                editor.remove_index(Transaction, index)
+        with transaction.atomic():
+            try:
+                with connection.cursor() as cursor:
+                    for sql in editor.collected_sql:
+                        cursor.execute(sql)
+                return self.run_queries(user, options)
+            finally:
+                transaction.set_rollback(True)
+
+    def pick_user(self, username):
+        if username:
+            return User.objects.filter(username=username).first()
+        heaviest = Transaction.objects.values('user_id').annotate(
+            total=Count('id')
+        ).order_by('-total').first()
+        if heaviest is None:
+            return None
+        return User.objects.get(pk=heaviest['user_id'])
+
+    def queries(self, user):
+        today = date.today()
+        month_start = today.replace(day=1)
+        quarter_start = today - timedelta(days=90)
+        category = Category.objects.filter(user=user, type='expense').first()
+        transactions = Transaction.objects.filter(user=user)
+
+        return {
+            'list_first_page': transactions.order_by('-date', '-created_at')[:20],
+            'list_deep_page': transactions.order_by('-date', '-created_at')[2000:2020],
+            'list_by_category': transactions.filter(category=category).order_by('-date')[:20],
+            'list_date_range': transactions.filter(date__gte=quarter_start).order_by('-date')[:20],
+            'summary_month': transactions.filter(date__gte=month_start, date__lte=today).values(
+                'category_id'
+            ).annotate(
+                income=Sum('amount', filter=Q(type='income')),
+                expenses=Sum('amount', filter=Q(type='expense')),
+            ).order_by('category_id'),
+            'budget_month_expenses': transactions.filter(
+                type='expense', date__gte=month_start, date__lte=today
+            ).values('category_id').annotate(total=Sum('amount')).order_by(),
+        }
+
+    def run_queries(self, user, options):
+        explain_options = {'analyze': True} if options['analyze'] and connection.vendor == 'postgresql' else {}
+        timings = {}
+        for name, queryset in self.queries(user).items():
+            self.stdout.write(self.style.SQL_TABLE(f'\n{name}'))
+            self.stdout.write(queryset.explain(**explain_options))
+
+            runs = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(queryset.all())
+                runs.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(runs)
+            self.stdout.write(f'median {timings[name]:.2f} ms over {len(runs)} runs')
+        return timings
+
+    def generate(self, user_count, per_user):
+        call_command(
+            'generate_dataset',
+            users=user_count,
+            per_user=per_user,
+            months=36,
+            prefix=BENCH_USER_PREFIX,
+            start=User.objects.filter(username__startswith=BENCH_USER_PREFIX).count(),
+            stdout=self.stdout,
+        )
@@ -0,0 +1,78 @@
+import statistics
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from transactions.models import Transaction
+from transactions.serializers import TransactionRowSerializer, TransactionSerializer
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Compare the ModelSerializer and values() read paths of the transaction list'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Username to benchmark against (default: the heaviest user)',
+        )
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='20,100,1000',
+            help='Comma-separated page sizes (default: 20,100,1000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Runs per measurement; the median is reported (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            heaviest = Transaction.objects.values('user_id').annotate(
+                total=Count('id')
+            ).order_by('-total').first()
+            user = User.objects.get(pk=heaviest['user_id']) if heaviest else None
+        if user is None:
+            self.stdout.write(self.style.ERROR('No transactions to benchmark. Use benchmark_queries --generate first.'))
+            return
+
+        transactions = Transaction.objects.filter(user=user).order_by('-date', '-created_at')
+        paths = {
+            'model serializer': lambda rows: TransactionSerializer(list(transactions[:rows]), many=True).data,
+            'model + select_related': lambda rows: TransactionSerializer(
+                list(transactions.select_related('category')[:rows]), many=True
+            ).data,
+            'values fast path': lambda rows: TransactionRowSerializer(
+                list(transactions.values(*TransactionRowSerializer.columns.values())[:rows]), many=True
+            ).data,
+        }
+
+        self.stdout.write(f'Benchmarking against {user.username} '
+                          f'({transactions.count()} transactions, median of {options["repeat"]} runs)')
+        self.stdout.write(f'{"rows":>6}  {"path":<24} {"queries":>7} {"ms":>9} {"us/row":>8} {"speedup":>8}')
+
+        for rows in [int(size) for size in options['sizes'].split(',')]:
+            baseline = None
+            for name, render in paths.items():
+                with CaptureQueriesContext(connection) as queries:
+                    rendered = render(rows)
+
+                runs = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    render(rows)
+                    runs.append((time.perf_counter() - started) * 1000)
+                elapsed = statistics.median(runs)
+                baseline = baseline or elapsed
+                per_row = elapsed * 1000 / max(len(rendered), 1)
+                self.stdout.write(
+                    f'{rows:>6}  {name:<24} {len(queries):>7} {elapsed:>9.2f} {per_row:>8.1f} {baseline / elapsed:>7.1f}x'
+                )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from helpers.cache import reset_response_cache_stats, response_cache_stats
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the per-user response cache (needs a shared cache backend)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them',
+        )
+
+    def handle(self, *args, **options):
+        for endpoint, stats in response_cache_stats().items():
+            hit_rate = f'{stats["hit_rate"]:.1%}' if stats['hit_rate'] is not None else '-'
+            self.stdout.write(
+                f'{endpoint:<24} hits {stats["hits"]:>8}  misses {stats["misses"]:>8}  hit rate {hit_rate}'
+            )
+
+        if options['reset']:
+            reset_response_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,279 @@
+import csv
+import io
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from accounts.purge import purge_users
+from budgets.models import Budget
+from helpers.periods import months_between
+from transactions.models import Category, MonthlyRollup, Transaction
+from transactions.rollups import build_rollups
+
+User = get_user_model()
+
+# name, type, color, median amount, spread (lognormal sigma), relative frequency, titles.
+# Salary and rent are booked once a month; the rest are drawn by frequency.
+CATEGORY_PROFILES = [
+    ('Salary', 'income', '#10B981', 3800, 0.15, 0, ['Monthly Salary']),
+    ('Freelance', 'income', '#059669', 600, 0.6, 2, ['Freelance Project', 'Consulting Fee']),
+    ('Investment Returns', 'income', '#047857', 150, 0.8, 1, ['Stock Dividend', 'Fund Distribution']),
+    ('Groceries', 'expense', '#EF4444', 60, 0.5, 25, ['Grocery Shopping', 'Supermarket', 'Farmers Market']),
+    ('Transportation', 'expense', '#DC2626', 35, 0.5, 15, ['Gas Station', 'Transit Pass', 'Ride Share']),
+    ('Entertainment', 'expense', '#B91C1C', 30, 0.6, 8, ['Movie Night', 'Concert Tickets', 'Bowling']),
+    ('Utilities', 'expense', '#991B1B', 110, 0.3, 3, ['Electric Bill', 'Water Bill', 'Internet Bill']),
+    ('Healthcare', 'expense', '#7F1D1D', 120, 0.8, 2, ['Doctor Visit', 'Pharmacy']),
+    ('Rent/Mortgage', 'expense', '#450A0A', 1400, 0.25, 0, ['Rent Payment']),
+    ('Dining Out', 'expense', '#F97316', 40, 0.5, 15, ['Restaurant Dinner', 'Lunch', 'Coffee Shop']),
+    ('Shopping', 'expense', '#EA580C', 70, 0.8, 10, ['Online Shopping', 'Clothing', 'Electronics']),
+    ('Subscriptions', 'expense', '#8B5CF6', 15, 0.4, 4, ['Netflix Subscription', 'Music Streaming', 'Cloud Storage']),
+    ('Travel', 'expense', '#7C3AED', 450, 0.7, 1, ['Weekend Trip', 'Flight', 'Hotel Booking']),
+    ('Personal Care', 'expense', '#EC4899', 35, 0.5, 4, ['Haircut', 'Gym Membership']),
+    ('Miscellaneous', 'expense', '#6B7280', 25, 0.9, 5, ['Miscellaneous Purchase']),
+]
+
+MONTHLY_CATEGORIES = {'Salary', 'Rent/Mortgage'}
+BUDGETED_CATEGORIES = 6
+TRANSACTION_COLUMNS = ['title', 'description', 'amount', 'type', 'category_id', 'user_id', 'date', 'created_at', 'updated_at']
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic dataset of users, categories, budgets and transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=1000,
+            help='Number of users to generate (default: 1000)',
+        )
+        parser.add_argument(
+            '--per-user',
+            type=int,
+            default=1000,
+            help='Transactions per user (default: 1000)',
+        )
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=24,
+            help='Months of history ending at --end-date (default: 24)',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=date.fromisoformat,
+            default=None,
+            help='Last day of generated history, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed and options give the same data (default: 0)',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default='load_user_',
+            help='Username prefix of generated users (default: load_user_)',
+        )
+        parser.add_argument(
+            '--start',
+            type=int,
+            default=0,
+            help='Index of the first generated user (default: 0)',
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            default='loadtest123',
+            help='Password of every generated user (default: loadtest123)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Transactions written per insert (default: 5000)',
+        )
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help='Load transactions with COPY on PostgreSQL',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete existing users with the same prefix first',
+        )
+
+    def handle(self, *args, **options):
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('--copy requires PostgreSQL')
+
+        prefix = options['prefix']
+        if options['clear']:
+            self.stdout.write(f'Clearing users starting with "{prefix}"...')
+            purge_users(User.objects.filter(username__startswith=prefix).values_list('pk', flat=True))
+
+        indexes = range(options['start'], options['start'] + options['users'])
+        usernames = [f'{prefix}{index:06d}' for index in indexes]
+        if User.objects.filter(username__in=usernames).exists():
+            raise CommandError(f'Users in {usernames[0]}..{usernames[-1]} already exist. Use --clear or --start.')
+
+        end_date = options['end_date'] or date.today()
+        start_year, start_month = divmod(end_date.year * 12 + end_date.month - options['months'], 12)
+        self.start_date, self.end_date = date(start_year, start_month + 1, 1), end_date
+        self.periods = months_between((start_year, start_month + 1), (end_date.year, end_date.month))
+        self.password = make_password(options['password'])
+        self.created_at = timezone.now()
+
+        # Users are written in chunks sized so each chunk holds about ten
+        # transaction batches.
+        chunk_size = max(1, min(500, options['batch_size'] * 10 // max(options['per_user'], 1)))
+        started = time.monotonic()
+        totals = {'users': 0, 'categories': 0, 'budgets': 0, 'transactions': 0}
+
+        for offset in range(0, len(usernames), chunk_size):
+            chunk = list(zip(indexes[offset:offset + chunk_size], usernames[offset:offset + chunk_size]))
+            with transaction.atomic():
+                counts = self.generate_chunk(chunk, options)
+            for key, value in counts.items():
+                totals[key] += value
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{totals["users"]}/{len(usernames)} users, {totals["transactions"]} transactions '
+                f'({totals["transactions"] / elapsed if elapsed else 0:.0f} rows/sec)'
+            )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {totals["users"]} users, {totals["categories"]} categories, {totals["budgets"]} budgets '
+            f'and {totals["transactions"]} transactions in {elapsed:.1f}s '
+            f'({totals["transactions"] / elapsed if elapsed else 0:.0f} transactions/sec)'
+        ))
+
+    def generate_chunk(self, chunk, options):
+        users = User.objects.bulk_create([
+            User(username=username, email=f'{username}@example.com', password=self.password)
+            for _, username in chunk
+        ])
+        if users[0].pk is None:
+            users = list(User.objects.filter(username__in=[user.username for user in users]).order_by('username'))
+
+        categories = Category.objects.bulk_create([
+            Category(user=user, name=name, type=type, color=color)
+            for user in users
+            for name, type, color, *_ in CATEGORY_PROFILES
+        ])
+        if categories[0].pk is None:
+            categories = list(Category.objects.filter(user__in=users).order_by('user_id', 'id'))
+        by_user = {}
+        for category in categories:
+            by_user.setdefault(category.user_id, {})[category.name] = category
+
+        budgets = []
+        rows = []
+        created = 0
+        for (index, _), user in zip(chunk, users):
+            rng = random.Random(f'{options["seed"]}-{index}')
+            budgets.extend(self.user_budgets(rng, user, by_user[user.pk]))
+            for row in self.user_transactions(rng, user, by_user[user.pk], options['per_user']):
+                rows.append(row)
+                if len(rows) >= options['batch_size']:
+                    created += self.insert_transactions(rows, options['copy'])
+                    rows = []
+        if rows:
+            created += self.insert_transactions(rows, options['copy'])
+
+        Budget.objects.bulk_create(budgets, batch_size=options['batch_size'])
+        MonthlyRollup.objects.bulk_create(
+            build_rollups(Transaction.objects.filter(user__in=users)),
+            batch_size=options['batch_size']
+        )
+        return {
+            'users': len(users),
+            'categories': len(categories),
+            'budgets': len(budgets),
+            'transactions': created,
+        }
+
+    def amount(self, rng, median, spread):
+        return Decimal(f'{max(1.0, median * rng.lognormvariate(0, spread)):.2f}')
+
+    def user_transactions(self, rng, user, categories, count):
+        """
+        Yield (title, description, amount, type, category_id, user_id, date) tuples.
+        """
+        profiles = {profile[0]: profile for profile in CATEGORY_PROFILES}
+        monthly = [name for name in profiles if name in MONTHLY_CATEGORIES]
+        drawn = [profile for profile in CATEGORY_PROFILES if profile[5]]
+        weights = [profile[5] for profile in drawn]
+        span = (self.end_date - self.start_date).days
+
+        # Payday and rent on the first of every month while the budget lasts.
+        scheduled = []
+        for year, month in self.periods:
+            for name in monthly:
+                scheduled.append((profiles[name], date(year, month, 1)))
+        scheduled = scheduled[:count]
+
+        for profile, day in scheduled:
+            yield self.transaction_row(rng, user, categories, profile, day)
+        for profile in rng.choices(drawn, weights, k=count - len(scheduled)):
+            day = self.start_date + timedelta(days=rng.randint(0, span))
+            yield self.transaction_row(rng, user, categories, profile, day)
+
+    def transaction_row(self, rng, user, categories, profile, day):
+        name, type, _, median, spread, _, titles = profile
+        return (
+            rng.choice(titles), name, self.amount(rng, median, spread),
+            type, categories[name].pk, user.pk, day,
+        )
+
+    def user_budgets(self, rng, user, categories):
+        expense_profiles = [profile for profile in CATEGORY_PROFILES if profile[1] == 'expense']
+        budgets = []
+        for year, month in self.periods:
+            budgets.append(Budget(
+                name='Monthly Budget', amount=Decimal(rng.randrange(3000, 6000, 100)),
+                category=None, user=user, month=month, year=year
+            ))
+            for name, _, _, median, _, frequency, _ in rng.sample(expense_profiles, BUDGETED_CATEGORIES):
+                expected = median * max(frequency, 1) * 1.1
+                budgets.append(Budget(
+                    name=f'{name} Budget', amount=Decimal(f'{expected * rng.uniform(0.8, 1.3):.0f}'),
+                    category=categories[name], user=user, month=month, year=year
+                ))
+        return budgets
+
+    def insert_transactions(self, rows, use_copy):
+        if use_copy:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            created_at = self.created_at.isoformat()
+            for row in rows:
+                writer.writerow(row + (created_at, created_at))
+            buffer.seek(0)
+            table = connection.ops.quote_name(Transaction._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY {table} ({", ".join(TRANSACTION_COLUMNS)}) FROM STDIN WITH (FORMAT csv)',
+                    buffer
+                )
+            return len(rows)
+
+        # _base_manager skips the per-batch rollup maintenance; rollups are
+        # rebuilt once per chunk instead.
+        Transaction._base_manager.bulk_create([
+            Transaction(
+                title=title, description=description, amount=amount, type=type,
+                category_id=category_id, user_id=user_id, date=day
+            )
+            for title, description, amount, type, category_id, user_id, day in rows
+        ])
+        return len(rows)
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from helpers import TRANSACTION_ERRORS
+from transactions.importers import UNREADABLE_FILE_ERRORS, TransactionImporter, detect_format, read_rows
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Stream a CSV or OFX bank statement into a user\'s transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Path to the CSV or OFX file')
+        parser.add_argument(
+            '--user',
+            type=str,
+            default='testuser',
+            help='Username to import transactions for (default: testuser)',
+        )
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=['csv', 'ofx'],
+            help='File format (default: detected from the file extension)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows inserted per batch (default: 1000)',
+        )
+        parser.add_argument(
+            '--date-format',
+            type=str,
+            help='strptime format for the date column (default: try common formats)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            self.stdout.write(
+                self.style.ERROR(f'User "{options["user"]}" does not exist. Please create users first.')
+            )
+            return
+
+        file_format = options['file_format'] or detect_format(options['path'])
+        importer = TransactionImporter(
+            user,
+            batch_size=options['batch_size'],
+            date_format=options['date_format']
+        )
+
+        def progress(stats):
+            self.stdout.write(f'Read {stats["rows"]} rows, imported {stats["imported"]}')
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                stats = importer.run(read_rows(stream, file_format), progress=progress)
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except UNREADABLE_FILE_ERRORS as exc:
+            raise CommandError(
+                f'{TRANSACTION_ERRORS.UNREADABLE_IMPORT_FILE} ({exc}; {importer.stats["imported"]} imported)'
+            )
+
+        for error in stats['errors']:
+            self.stdout.write(self.style.WARNING(f'Line {error["line"]}: {error["error"]}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats["imported"]} of {stats["rows"]} rows for {user.username} '
+            f'({stats["duplicates"]} duplicates, {stats["failed"]} failed, '
+            f'{stats["categories_created"]} new categories) in {stats["seconds"]}s '
+            f'- {stats["rows_per_second"]} rows/sec'
+        ))
@@ -0,0 +1,50 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand
+from transactions.models import RecurringRule
+from transactions.recurring import materialize_due
+
+class Command(BaseCommand):
+    help = 'Book every due occurrence of active recurring rules as transactions (safe to re-run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=date.fromisoformat,
+            default=None,
+            help='Book occurrences up to this day, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rules processed per database transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the rules that are due',
+        )
+
+    def handle(self, *args, **options):
+        until = options['date'] or date.today()
+        if options['dry_run']:
+            due = RecurringRule.objects.filter(active=True, next_date__lte=until).count()
+            self.stdout.write(f'{due} recurring rules are due on or before {until}')
+            return
+
+        started = time.monotonic()
+        rules = created = 0
+        for batch_rules, batch_created in materialize_due(until, options['batch_size']):
+            rules += batch_rules
+            created += batch_created
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{rules} rules, {created} transactions ({rules / elapsed if elapsed else 0:.0f} rules/sec)'
+            )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized {created} transactions from {rules} rules due on or before {until} '
+            f'in {elapsed:.2f}s ({rules / elapsed if elapsed else 0:.0f} rules/sec)'
+        ))
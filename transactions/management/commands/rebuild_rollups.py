@@ -0,0 +1,94 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from transactions.models import ArchivedTransaction, MonthlyRollup, Transaction
+from transactions.rollups import build_rollups
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the monthly transaction rollups from raw (live and archived) transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only rebuild rollups for this username (default: all users)',
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare rollups against raw transactions without writing',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of users processed per batch (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'User "{options["user"]}" does not exist.')
+                )
+                return
+
+        user_ids = list(users.values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        rollups_written = 0
+        mismatches = 0
+
+        for offset in range(0, len(user_ids), batch_size):
+            batch = user_ids[offset:offset + batch_size]
+            expected = build_rollups(
+                Transaction.objects.filter(user_id__in=batch),
+                ArchivedTransaction.objects.filter(user_id__in=batch)
+            )
+
+            if options['verify']:
+                mismatches += self.verify_batch(batch, expected)
+                continue
+
+            with transaction.atomic():
+                MonthlyRollup.objects.filter(user_id__in=batch).delete()
+                MonthlyRollup.objects.bulk_create(expected, batch_size=1000)
+            rollups_written += len(expected)
+            self.stdout.write(f'Processed {min(offset + batch_size, len(user_ids))}/{len(user_ids)} users')
+
+        elapsed = time.monotonic() - started
+        if options['verify']:
+            if mismatches:
+                raise CommandError(f'Found {mismatches} mismatched rollup rows in {elapsed:.2f}s')
+            self.stdout.write(
+                self.style.SUCCESS(f'Rollups match raw transactions for {len(user_ids)} users ({elapsed:.2f}s)')
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {rollups_written} rollup rows for {len(user_ids)} users in {elapsed:.2f}s')
+        )
+
+    def verify_batch(self, user_ids, expected):
+        def key(rollup):
+            return (rollup.user_id, rollup.year, rollup.month, rollup.category_id, rollup.type)
+
+        expected = {key(rollup): (rollup.total, rollup.count) for rollup in expected}
+        actual = {
+            key(rollup): (rollup.total, rollup.count)
+            for rollup in MonthlyRollup.objects.filter(user_id__in=user_ids)
+        }
+
+        mismatches = 0
+        for bucket in expected.keys() | actual.keys():
+            if expected.get(bucket) != actual.get(bucket):
+                mismatches += 1
+                self.stdout.write(
+                    self.style.WARNING(f'Mismatch {bucket}: expected {expected.get(bucket)}, found {actual.get(bucket)}')
+                )
+        return mismatches
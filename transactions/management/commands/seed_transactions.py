@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from transactions.models import Category, Transaction
+from accounts.purge import purge_transactions
 from decimal import Decimal
 import random
 from datetime import date, timedelta
@@ -50,7 +51,7 @@ class Command(BaseCommand):
 
         if options['clear']:
             self.stdout.write('Clearing existing transactions...')
-            Transaction.objects.filter(user=user).delete()
+            purge_transactions(user.pk)
 
         income_categories = categories.filter(type='income')
         expense_categories = categories.filter(type='expense')
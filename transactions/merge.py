@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.utils import timezone
+from budgets.models import Budget
+from .models import ArchivedTransaction, Category, RecurringRule, Transaction
+from .rollups import affected_months, rebuild_months
+from .signals import send_transactions_changed
+
+def merge_budgets(user, source_ids, target_id):
+    """
+    Reassign the sources' budgets to the target category. Where a month
+    would end up with several budgets for the target, the target's own
+    budget (or else the oldest one) takes the sum of their amounts and the
+    others are deleted. Returns (budgets moved, budgets merged away, periods).
+    """
+    budgets = list(Budget.objects.filter(user=user, category_id__in=[*source_ids, target_id]).order_by('id'))
+    survivors = {}
+    for budget in budgets:
+        period = (budget.year, budget.month)
+        survivor = survivors.get(period)
+        if survivor is None or (budget.category_id == target_id and survivor.category_id != target_id):
+            survivors[period] = budget
+
+    changed, removed = {}, []
+    for budget in budgets:
+        survivor = survivors[(budget.year, budget.month)]
+        if budget is not survivor:
+            survivor.amount += budget.amount
+            changed[survivor.pk] = survivor
+            removed.append(budget.pk)
+        elif budget.category_id != target_id:
+            changed[survivor.pk] = survivor
+
+    now = timezone.now()
+    for survivor in changed.values():
+        survivor.category_id, survivor.updated_at = target_id, now
+    if removed:
+        Budget.objects.filter(pk__in=removed).delete()
+    if changed:
+        Budget.objects.bulk_update(list(changed.values()), ['category', 'amount', 'updated_at'])
+    return len(changed), len(removed), set(survivors)
+
+def merge_categories(user, source_ids, target, delete_sources=True):
+    """
+    Move every transaction (live and archived), recurring rule and budget of
+    the source categories to target in one database transaction, then
+    optionally delete the now empty sources.
+
+    Rows are moved with set-based UPDATEs and rollups are rebuilt only for
+    the affected months, so the number of queries does not depend on how
+    many transactions move.
+    """
+    source_ids = [pk for pk in source_ids if pk != target.pk]
+    with transaction.atomic():
+        live = Transaction._base_manager.filter(user=user, category_id__in=source_ids)
+        archived = ArchivedTransaction.objects.filter(user=user, category_id__in=source_ids)
+        months = affected_months(live) | affected_months(archived)
+
+        # _base_manager skips the per-row rollup bookkeeping of
+        # Transaction.objects; the affected months are rebuilt below.
+        now = timezone.now()
+        moved = live.update(category_id=target.pk, updated_at=now)
+        moved_archived = archived.update(category_id=target.pk)
+        rules = RecurringRule.objects.filter(user=user, category_id__in=source_ids).update(
+            category_id=target.pk, updated_at=now
+        )
+        budgets, budgets_merged, periods = merge_budgets(user, source_ids, target.pk)
+
+        rebuild_months(months)
+        deleted = 0
+        if delete_sources:
+            deleted = Category.objects.filter(user=user, pk__in=source_ids).delete()[1].get(Category._meta.label, 0)
+
+        # Refreshes cached responses and budget alerts for every month touched.
+        send_transactions_changed(months | {(user.pk, year, month) for year, month in periods})
+
+    return {
+        'target': target.pk,
+        'transactions': moved,
+        'archived_transactions': moved_archived,
+        'recurring_rules': rules,
+        'budgets': budgets,
+        'budgets_merged': budgets_merged,
+        'categories_deleted': deleted,
+    }
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.auth.models import User
 
@@ -21,6 +21,71 @@ class Category(models.Model):
     def __str__(self):
         return f"{self.name} ({self.type})"
 
+ROLLUP_FIELDS = {'amount', 'type', 'category', 'category_id', 'user', 'user_id', 'date'}
+
+class TransactionQuerySet(models.QuerySet):
+    """
+    Keeps MonthlyRollup in step with writes that bypass Transaction.save()
+    and Transaction.delete().
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .rollups import apply_deltas, rollup_deltas
+        from .signals import send_transactions_changed
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            deltas = rollup_deltas([obj.rollup_state() for obj in objs])
+            apply_deltas(deltas)
+            send_transactions_changed({key[:3] for key in deltas}, using=self.db)
+        return objs
+
+    def update(self, **kwargs):
+        from .rollups import affected_months, rebuild_months
+        from .signals import send_transactions_changed
+
+        if not ROLLUP_FIELDS.intersection(kwargs):
+            with transaction.atomic(using=self.db):
+                send_transactions_changed(affected_months(self), using=self.db)
+                return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            months = affected_months(self)
+            moved = None
+            if {'date', 'user', 'user_id'}.intersection(kwargs):
+                # Rows may leave the filter once updated; track them by pk.
+                moved = self.model.objects.filter(pk__in=list(self.values_list('pk', flat=True)))
+            rows = super().update(**kwargs)
+            if moved is not None:
+                months |= affected_months(moved)
+            rebuild_months(months)
+            send_transactions_changed(months, using=self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        from .rollups import apply_deltas, rollup_deltas_for_queryset
+        from .signals import send_transactions_changed
+
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with delete().")
+
+        with transaction.atomic(using=self.db):
+            # The grouped read cannot take FOR UPDATE, so lock the rows first
+            # and work on exactly those: a concurrent save() can then neither
+            # move a row between the read and the DELETE nor add one to it.
+            pks = list(self.order_by().select_for_update().values_list('pk', flat=True))
+            rows = self.model._base_manager.using(self.db).filter(pk__in=pks)
+            deltas = rollup_deltas_for_queryset(rows, sign=-1)
+            result = rows.delete()
+            apply_deltas(deltas)
+            send_transactions_changed({key[:3] for key in deltas}, using=self.db)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
         ('income', 'Income'),
@@ -37,8 +102,160 @@ class Transaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TransactionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            # List view: a user's rows newest first, optionally narrowed by date.
+            models.Index(fields=['user', '-date', '-created_at'], name='txn_user_date_idx'),
+            # Summary and budget scans: a user's income or expenses over a date range.
+            models.Index(fields=['user', 'type', 'date'], name='txn_user_type_date_idx'),
+            # Category filter on the list view and category-scoped scans.
+            models.Index(fields=['category', '-date'], name='txn_category_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - ${self.amount}"
+
+    def rollup_state(self):
+        """
+        (user_id, year, month, category_id, type, amount) as counted in MonthlyRollup.
+        """
+        day = self._meta.get_field('date').to_python(self.date)
+        amount = self._meta.get_field('amount').to_python(self.amount)
+        return (self.user_id, day.year, day.month, self.category_id, self.type, amount)
+
+    def stored_for_update(self):
+        """
+        The row as stored, locked until the end of the transaction, or None.
+        """
+        return Transaction._base_manager.select_for_update().filter(pk=self.pk).first()
+
+    def save(self, *args, **kwargs):
+        from .rollups import apply_deltas, rollup_deltas
+        from .signals import send_transactions_changed
+
+        with transaction.atomic():
+            # Compare against the stored row, not this instance: another copy
+            # of it may have been saved since it was loaded.
+            previous = None
+            if not self._state.adding:
+                stored = self.stored_for_update()
+                previous = stored.rollup_state() if stored else None
+            super().save(*args, **kwargs)
+            current = self.rollup_state()
+            if current != previous:
+                deltas = rollup_deltas([current])
+                if previous is not None:
+                    deltas = rollup_deltas([previous], sign=-1, deltas=deltas)
+                apply_deltas(deltas)
+            months = {current[:3]}
+            if previous is not None:
+                months.add(previous[:3])
+            send_transactions_changed(months)
+
+    def delete(self, *args, **kwargs):
+        from .rollups import apply_deltas, rollup_deltas
+        from .signals import send_transactions_changed
+
+        with transaction.atomic():
+            stored = self.stored_for_update()
+            result = super().delete(*args, **kwargs)
+            # Nothing to subtract if another copy already deleted the row.
+            if result[0] and stored is not None:
+                state = stored.rollup_state()
+                apply_deltas(rollup_deltas([state], sign=-1))
+                send_transactions_changed([state[:3]])
+        return result
+
+class MonthlyRollup(models.Model):
+    """
+    Per-user monthly totals by category and type, maintained on every
+    Transaction write so analytics can read whole months without scanning
+    raw transactions.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    year = models.IntegerField()
+    month = models.IntegerField()
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'year', 'month', 'category', 'type']
+
+    def __str__(self):
+        return f"{self.user_id} {self.month}/{self.year} {self.category_id} {self.type}: {self.total}"
+
+class ArchivedTransaction(models.Model):
+    """
+    Cold storage for transactions older than the archive horizon, moved here
+    by the archive_transactions command. Rows keep their original ids and
+    still count in MonthlyRollup; summaries, trends and exports that reach
+    back past the cutoff read this table as well.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    date = models.DateField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='txn_archive_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - ${self.amount} (archived)"
+
+
+class RecurringRule(models.Model):
+    """
+    A transaction repeated every `interval` days, weeks, months or years
+    from start_date, optionally until end_date or for `count` occurrences.
+    The materialize_recurring command books due occurrences as transactions;
+    next_date is the first one not booked yet (None once the rule is done).
+    """
+    FREQUENCIES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='recurring_rules')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    frequency = models.CharField(max_length=10, choices=FREQUENCIES)
+    interval = models.PositiveIntegerField(default=1)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    active = models.BooleanField(default=True)
+    next_date = models.DateField(null=True, blank=True)
+    last_date = models.DateField(null=True, blank=True)
+    occurrences = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['next_date', 'id']
+        indexes = [
+            # Scheduler scan: active rules due on or before a date.
+            models.Index(fields=['active', 'next_date'], name='recurring_due_idx'),
+            models.Index(fields=['user', 'next_date'], name='recurring_user_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} - ${self.amount}"
\ No newline at end of file
+        return f"{self.title} every {self.interval} {self.frequency}"
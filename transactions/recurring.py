@@ -0,0 +1,91 @@
+import calendar
+from datetime import timedelta
+from django.db import connection, transaction
+from .models import RecurringRule, Transaction
+
+# Longest possible gap per unit, so estimates never overshoot an occurrence.
+MAX_UNIT_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 31, 'yearly': 366}
+
+def add_months(day, months):
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    return day.replace(year=year, month=month + 1, day=min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+def occurrence(rule, index):
+    """
+    Date of the index-th occurrence (0-based). Counted from start_date, so
+    monthly rules anchored on the 31st fall on the last day of short months
+    and return to the 31st afterwards.
+    """
+    steps = index * rule.interval
+    if rule.frequency == 'daily':
+        return rule.start_date + timedelta(days=steps)
+    if rule.frequency == 'weekly':
+        return rule.start_date + timedelta(weeks=steps)
+    return add_months(rule.start_date, steps * (12 if rule.frequency == 'yearly' else 1))
+
+def next_occurrence(rule, after=None):
+    """
+    First occurrence after the given date (the first one at all when None),
+    or None when the rule has ended or used up its count.
+    """
+    if rule.count is not None and rule.occurrences >= rule.count:
+        return None
+    index = 0
+    if after is not None and after >= rule.start_date:
+        index = (after - rule.start_date).days // (MAX_UNIT_DAYS[rule.frequency] * rule.interval)
+        while occurrence(rule, index) <= after:
+            index += 1
+    day = occurrence(rule, index)
+    if rule.end_date is not None and day > rule.end_date:
+        return None
+    return day
+
+def schedule(rule):
+    """
+    Recompute next_date after the rule is created or its schedule changes.
+    Occurrences already booked are not repeated.
+    """
+    rule.next_date = next_occurrence(rule, rule.last_date)
+    return rule
+
+def due_occurrences(rule, until):
+    """
+    Book the rule's occurrences up to `until` in memory: yields unsaved
+    transactions and advances next_date, last_date and occurrences.
+    """
+    while rule.next_date is not None and rule.next_date <= until:
+        yield Transaction(
+            title=rule.title, description=rule.description, amount=rule.amount,
+            type=rule.type, category_id=rule.category_id, user_id=rule.user_id,
+            date=rule.next_date
+        )
+        rule.last_date = rule.next_date
+        rule.occurrences += 1
+        rule.next_date = next_occurrence(rule, rule.last_date)
+
+def materialize_due(until, batch_size=1000):
+    """
+    Materialize every active rule due on or before `until`, batch_size rules
+    per database transaction, yielding (rules, transactions) per batch.
+
+    Each batch locks its rules, writes their transactions with one
+    bulk_create (which also maintains rollups and fires change signals) and
+    advances the rules in the same transaction, so re-running never books an
+    occurrence twice. Concurrent runs skip each other's locked rules on
+    databases with SKIP LOCKED; elsewhere run one scheduler at a time.
+    """
+    due = RecurringRule.objects.filter(active=True, next_date__lte=until).order_by('pk')
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rules = list(due.filter(pk__gt=last_pk).select_for_update(skip_locked=skip_locked)[:batch_size])
+            if not rules:
+                return
+            created = Transaction.objects.bulk_create(
+                [obj for rule in rules for obj in due_occurrences(rule, until)]
+            )
+            RecurringRule.objects.bulk_update(rules, ['next_date', 'last_date', 'occurrences'])
+        last_pk = rules[-1].pk
+        yield len(rules), len(created)
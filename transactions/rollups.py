@@ -0,0 +1,147 @@
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from helpers.periods import month_bounds
+from .models import ArchivedTransaction, MonthlyRollup, Transaction
+from .signals import send_transactions_changed
+
+def rollup_deltas(states, sign=1, deltas=None):
+    """
+    Fold Transaction.rollup_state() tuples into {bucket: [total, count]}.
+    """
+    deltas = {} if deltas is None else deltas
+    for user_id, year, month, category_id, type, amount in states:
+        delta = deltas.setdefault((user_id, year, month, category_id, type), [Decimal('0'), 0])
+        delta[0] += sign * amount
+        delta[1] += sign
+    return deltas
+
+def grouped_totals(queryset):
+    return queryset.annotate(
+        year=ExtractYear('date'),
+        month=ExtractMonth('date')
+    ).values('user_id', 'year', 'month', 'category_id', 'type').annotate(
+        total=Sum('amount'),
+        count=Count('id')
+    ).order_by()
+
+def rollup_deltas_for_queryset(queryset, sign=1):
+    deltas = {}
+    for row in grouped_totals(queryset):
+        key = (row['user_id'], row['year'], row['month'], row['category_id'], row['type'])
+        deltas[key] = [sign * row['total'], sign * row['count']]
+    return deltas
+
+def affected_months(queryset):
+    return set(
+        queryset.annotate(
+            year=ExtractYear('date'),
+            month=ExtractMonth('date')
+        ).values_list('user_id', 'year', 'month').distinct().order_by()
+    )
+
+def category_deleted_receiver(sender, instance, using='default', **kwargs):
+    """
+    pre_delete receiver for Category. Its live and archived transactions go
+    with it through the cascade, which sends no transactions_changed, so
+    announce the months they were in (read from its rollups before they are
+    cascaded too) to re-evaluate budget alerts such as the overall budget's.
+    """
+    months = MonthlyRollup.objects.using(using).filter(category=instance).values_list(
+        'user_id', 'year', 'month'
+    ).distinct().order_by()
+    send_transactions_changed(months, using=using)
+
+def months_filter(months):
+    month_filter = Q()
+    for user_id, year, month in months:
+        month_filter |= Q(user_id=user_id, year=year, month=month)
+    return month_filter
+
+def apply_deltas(deltas):
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    months = {key[:3] for key in deltas}
+    with transaction.atomic():
+        existing = {
+            (rollup.user_id, rollup.year, rollup.month, rollup.category_id, rollup.type): rollup
+            for rollup in MonthlyRollup.objects.select_for_update().filter(months_filter(months))
+        }
+
+        to_update, to_delete, to_create = [], [], {}
+        for key, (total, count) in deltas.items():
+            rollup = existing.get(key)
+            if rollup is None:
+                # A negative delta for a missing bucket means the rollup is
+                # already out of step; rebuild_rollups repairs it.
+                if count > 0:
+                    to_create[key] = [total, count]
+                continue
+            rollup.total += total
+            rollup.count += count
+            if rollup.count > 0:
+                to_update.append(rollup)
+            else:
+                to_delete.append(rollup.pk)
+
+        if to_update:
+            MonthlyRollup.objects.bulk_update(to_update, ['total', 'count'])
+        if to_delete:
+            MonthlyRollup.objects.filter(pk__in=to_delete).delete()
+        if to_create:
+            try:
+                with transaction.atomic():
+                    MonthlyRollup.objects.bulk_create([
+                        MonthlyRollup(
+                            user_id=user_id, year=year, month=month,
+                            category_id=category_id, type=type,
+                            total=total, count=count
+                        )
+                        for (user_id, year, month, category_id, type), (total, count) in to_create.items()
+                    ])
+            except IntegrityError:
+                # A concurrent writer created one of these buckets first.
+                apply_deltas(to_create)
+
+def build_rollups(*querysets):
+    """
+    Rollup rows for the transactions in querysets (live and archived rows
+    of the same months are added together).
+    """
+    totals = {}
+    for queryset in querysets:
+        for row in grouped_totals(queryset):
+            key = (row['user_id'], row['year'], row['month'], row['category_id'], row['type'])
+            total = totals.setdefault(key, [Decimal('0'), 0])
+            total[0] += row['total']
+            total[1] += row['count']
+    return [
+        MonthlyRollup(
+            user_id=user_id, year=year, month=month,
+            category_id=category_id, type=type,
+            total=total, count=count
+        )
+        for (user_id, year, month, category_id, type), (total, count) in totals.items()
+    ]
+
+def rebuild_months(months):
+    """
+    Recompute the rollup rows for a set of (user_id, year, month) buckets.
+    """
+    if not months:
+        return
+
+    date_filter = Q()
+    for user_id, year, month in months:
+        start_date, end_date = month_bounds(year, month)
+        date_filter |= Q(user_id=user_id, date__gte=start_date, date__lt=end_date)
+
+    with transaction.atomic():
+        MonthlyRollup.objects.filter(months_filter(months)).delete()
+        MonthlyRollup.objects.bulk_create(build_rollups(
+            Transaction.objects.filter(date_filter),
+            ArchivedTransaction.objects.filter(date_filter)
+        ))
@@ -0,0 +1,76 @@
+import re
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import OrderingFilter, SearchFilter
+from .models import Transaction
+
+SEARCH_CONFIG = 'english'
+SEARCH_COLUMN = 'search_vector'
+SEARCH_INDEX = 'txn_search_vector_idx'
+
+def install_search_vector(using='default', **kwargs):
+    """
+    Add the full-text column and its GIN index on PostgreSQL.
+
+    The column is a stored generated column, so PostgreSQL keeps it in step
+    with title/description on every write, including bulk_create and
+    queryset updates. Other backends keep using LIKE-based search.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {SEARCH_COLUMN} tsvector "
+            f"GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+            f") STORED"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} ON {table} USING GIN ({SEARCH_COLUMN})"
+        )
+
+def prefix_query(terms):
+    """
+    Turn search terms into a to_tsquery() string that matches word prefixes,
+    e.g. ['netfl', 'sub'] -> 'netfl:* & sub:*'.
+    """
+    words = [word for term in terms for word in re.findall(r'\w+', term)]
+    return ' & '.join(f'{word}:*' for word in words)
+
+class TransactionSearchFilter(SearchFilter):
+    """
+    Full-text search over the indexed search_vector column on PostgreSQL,
+    annotating each row with search_rank. Falls back to SearchFilter's
+    icontains matching on other databases.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = prefix_query(self.get_search_terms(request))
+        if not query:
+            return queryset
+
+        column = f'{Transaction._meta.db_table}.{SEARCH_COLUMN}'
+        tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(f'{column} @@ {tsquery}', (query,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank({column}, {tsquery})', (query,), output_field=FloatField())
+        )
+
+class TransactionOrderingFilter(OrderingFilter):
+    """
+    Orders ranked search results by relevance unless ?ordering= is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if self.ordering_param not in request.query_params and 'search_rank' in queryset.query.annotations:
+            return queryset.order_by('-search_rank', *self.get_default_ordering(view))
+        return super().filter_queryset(request, queryset, view)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import Category, Transaction
-from helpers import CATEGEORY_ERRORS
+from .models import Category, RecurringRule, Transaction
+from .recurring import schedule
+from helpers import CATEGEORY_ERRORS, TRANSACTION_ERRORS
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -32,4 +33,99 @@ class TransactionSerializer(serializers.ModelSerializer):
     def validate_category(self, value):
         if value.user != self.context['request'].user:
             raise serializers.ValidationError(CATEGEORY_ERRORS.YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES)
-        return value
\ No newline at end of file
+        return value
+
+class TransactionRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path for transaction lists.
+
+    Renders rows from queryset.values(*TransactionRowSerializer.columns)
+    into exactly what TransactionSerializer produces, reusing its field
+    formatters for amounts, dates and timestamps but skipping the per-field
+    attribute lookups, source traversal and ModelSerializer machinery.
+    """
+    columns = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'amount': 'amount',
+        'type': 'type',
+        'category': 'category_id',
+        'category_name': 'category__name',
+        'category_color': 'category__color',
+        'date': 'date',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    formatted_fields = ['amount', 'date', 'created_at', 'updated_at']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = TransactionSerializer().fields
+        self.formatters = [
+            (name, column, fields[name].to_representation if name in self.formatted_fields else None)
+            for name, column in self.columns.items()
+        ]
+
+    def to_representation(self, row):
+        data = {}
+        for name, column, format in self.formatters:
+            value = row[column]
+            data[name] = format(value) if format is not None and value is not None else value
+        return data
+
+class BulkTransactionSerializer(TransactionSerializer):
+    """
+    Validates one item of a bulk request. Categories are resolved against
+    the owned categories preloaded into context['categories'] instead of
+    one lookup per item.
+    """
+    category = serializers.IntegerField()
+
+    def validate_category(self, value):
+        category = self.context['categories'].get(value)
+        if category is None:
+            raise serializers.ValidationError(CATEGEORY_ERRORS.YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES)
+        return category
+
+class RecurringRuleSerializer(serializers.ModelSerializer):
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    schedule_fields = {'frequency', 'interval', 'start_date', 'end_date', 'count'}
+
+    class Meta:
+        model = RecurringRule
+        fields = [
+            'id', 'title', 'description', 'amount', 'type',
+            'category', 'category_name', 'frequency', 'interval',
+            'start_date', 'end_date', 'count', 'active',
+            'next_date', 'last_date', 'occurrences', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['next_date', 'last_date', 'occurrences', 'created_at', 'updated_at']
+        extra_kwargs = {'interval': {'min_value': 1}, 'count': {'min_value': 1}}
+
+    def validate_category(self, value):
+        if value.user != self.context['request'].user:
+            raise serializers.ValidationError(CATEGEORY_ERRORS.YOU_CAN_ONLY_USE_YOUR_OWN_CATEGORIES)
+        return value
+
+    def validate(self, attrs):
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': TRANSACTION_ERRORS.RECURRING_END_BEFORE_START})
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        rule = schedule(RecurringRule(**validated_data))
+        rule.save()
+        return rule
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if self.schedule_fields.intersection(validated_data):
+            schedule(instance)
+        instance.save()
+        return instance
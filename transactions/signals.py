@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.dispatch import Signal
+
+# Sent once per committed write to Transaction rows, from every write path
+# (save, delete, bulk_create, queryset update/delete), with
+# months={(user_id, year, month), ...} naming the buckets that changed.
+transactions_changed = Signal()
+
+def send_transactions_changed(months, using='default'):
+    months = {tuple(month) for month in months}
+    if not months:
+        return
+    transaction.on_commit(
+        lambda: transactions_changed.send(sender=None, months=months),
+        using=using
+    )
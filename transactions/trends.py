@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from helpers.periods import next_month, period_filter, whole_months
+from .archive import transaction_models
+from .models import MonthlyRollup
+
+TREND_INTERVALS = ['day', 'week', 'month']
+TRENDS_MAX_BUCKETS = 2000
+DEFAULT_TREND_BUCKETS = 12
+
+def bucket_start(day, interval):
+    if interval == 'month':
+        return day.replace(day=1)
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+def next_bucket(day, interval):
+    if interval == 'month':
+        return date(*next_month(day.year, day.month), 1)
+    return day + timedelta(days=7 if interval == 'week' else 1)
+
+def bucket_starts(start_date, end_date, interval):
+    buckets = []
+    bucket = bucket_start(start_date, interval)
+    while bucket <= end_date:
+        buckets.append(bucket)
+        bucket = next_bucket(bucket, interval)
+    return buckets
+
+def bucket_count(start_date, end_date, interval):
+    if interval == 'month':
+        return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    first, last = bucket_start(start_date, interval), bucket_start(end_date, interval)
+    return (last - first).days // (7 if interval == 'week' else 1) + 1
+
+def default_start(end_date, interval):
+    bucket = bucket_start(end_date, interval)
+    for _ in range(DEFAULT_TREND_BUCKETS - 1):
+        if interval == 'month':
+            bucket = (bucket - timedelta(days=1)).replace(day=1)
+        else:
+            bucket -= timedelta(days=7 if interval == 'week' else 1)
+    return bucket
+
+def grouped_trends(user, start_date, end_date, interval, by_category):
+    """
+    Grouped rows with bucket, income and expenses (plus category columns
+    when by_category is set): one query over rollups, or one per live and
+    archived transaction table. A bucket may appear in several rows.
+    """
+    months = whole_months(start_date, end_date) if interval == 'month' and settings.USE_MONTHLY_ROLLUPS else None
+    if months:
+        querysets = [MonthlyRollup.objects.filter(period_filter(*months), user=user)]
+        group_by, amount_field = ['year', 'month'], 'total'
+    else:
+        querysets = []
+        for model in transaction_models(start_date):
+            queryset = model.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
+            if interval == 'month':
+                queryset = queryset.annotate(bucket=TruncMonth('date'))
+            elif interval == 'week':
+                queryset = queryset.annotate(bucket=TruncWeek('date'))
+            querysets.append(queryset)
+        group_by, amount_field = ['bucket' if interval != 'day' else 'date'], 'amount'
+
+    if by_category:
+        group_by += ['category_id', 'category__name', 'category__type', 'category__color']
+
+    for queryset in querysets:
+        rows = queryset.values(*group_by).annotate(
+            income=Sum(amount_field, filter=Q(type='income')),
+            expenses=Sum(amount_field, filter=Q(type='expense')),
+        ).order_by()
+
+        for row in rows:
+            if months:
+                row['bucket'] = date(row['year'], row['month'], 1)
+            elif interval == 'day':
+                row['bucket'] = row['date']
+            yield row
+
+def build_trends(user, start_date, end_date, interval, by_category=False):
+    """
+    Income, expenses and net per bucket as parallel arrays, with every
+    bucket in the range present (zero-filled), optionally broken down by
+    category.
+    """
+    buckets = bucket_starts(start_date, end_date, interval)
+    positions = {bucket: index for index, bucket in enumerate(buckets)}
+    income = [Decimal('0')] * len(buckets)
+    expenses = [Decimal('0')] * len(buckets)
+    categories = {}
+
+    for row in grouped_trends(user, start_date, end_date, interval, by_category):
+        index = positions[bucket_start(row['bucket'], interval)]
+        row_income = row['income'] or 0
+        row_expenses = row['expenses'] or 0
+        income[index] += row_income
+        expenses[index] += row_expenses
+
+        if by_category:
+            category = categories.get(row['category_id'])
+            if category is None:
+                category = categories[row['category_id']] = {
+                    'id': row['category_id'],
+                    'name': row['category__name'],
+                    'type': row['category__type'],
+                    'color': row['category__color'],
+                    'totals': [Decimal('0')] * len(buckets),
+                }
+            category['totals'][index] += row_income + row_expenses
+
+    trends = {
+        'interval': interval,
+        'start_date': start_date,
+        'end_date': end_date,
+        'buckets': buckets,
+        'income': [float(total) for total in income],
+        'expenses': [float(total) for total in expenses],
+        'net': [float(inflow - outflow) for inflow, outflow in zip(income, expenses)],
+    }
+    if by_category:
+        trends['categories'] = [
+            dict(category, totals=[float(total) for total in category['totals']])
+            for _, category in sorted(categories.items())
+        ]
+    return trends
@@ -3,8 +3,15 @@ from . import views
 
 urlpatterns = [
     path('categories/', views.CategoryListCreateView.as_view(), name='category-list'),
+    path('categories/merge/', views.category_merge, name='category-merge'),
     path('categories/<int:pk>/', views.CategoryDetailView.as_view(), name='category-detail'),
+    path('recurring/', views.RecurringRuleListCreateView.as_view(), name='recurring-rule-list'),
+    path('recurring/<int:pk>/', views.RecurringRuleDetailView.as_view(), name='recurring-rule-detail'),
     path('', views.TransactionListCreateView.as_view(), name='transaction-list'),
     path('<int:pk>/', views.TransactionDetailView.as_view(), name='transaction-detail'),
+    path('bulk/', views.TransactionBulkView.as_view(), name='transaction-bulk'),
+    path('import/', views.import_transactions, name='transaction-import'),
+    path('export/', views.TransactionExportView.as_view(), name='transaction-export'),
     path('summary/', views.financial_summary, name='financial-summary'),
+    path('trends/', views.transaction_trends, name='transaction-trends'),
 ]
\ No newline at end of file
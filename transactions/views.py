@@ -1,43 +1,132 @@
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from django.conf import settings
 from django.db.models import Sum, Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import datetime, date
-from .models import Category, Transaction
-from .serializers import CategorySerializer, TransactionSerializer
+from helpers.cache import ConditionalGetMixin, cached_response, conditional_get
+from helpers.periods import period_filter, whole_months
+from helpers.replicas import replica_reads
+from .archive import transaction_models
+from .exports import EXPORT_FORMATS, export_file, export_stream
+from .importers import UNREADABLE_FILE_ERRORS, TransactionImporter, detect_format, read_rows
+from .merge import merge_categories
+from .models import ArchivedTransaction, Category, MonthlyRollup, RecurringRule, Transaction
+from .pagination import TransactionCursorPagination
+from .search import TransactionOrderingFilter, TransactionSearchFilter
+from .trends import TREND_INTERVALS, TRENDS_MAX_BUCKETS, bucket_count, build_trends, default_start
+from .serializers import (
+    BulkTransactionSerializer, CategorySerializer, RecurringRuleSerializer, TransactionRowSerializer,
+    TransactionSerializer
+)
+from helpers import CATEGEORY_ERRORS, TRANSACTION_ERRORS
 
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
+    lightweight_user = True
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['type']
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    """
+    DELETE cascades to the category's transactions and budgets unless
+    ?reassign_to=<category id> is given, which moves them there first.
+    """
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
 
-class TransactionListCreateView(generics.ListCreateAPIView):
-    serializer_class = TransactionSerializer
+    def destroy(self, request, *args, **kwargs):
+        if 'reassign_to' not in request.query_params:
+            return super().destroy(request, *args, **kwargs)
+
+        category = self.get_object()
+        target = Category.objects.filter(user=request.user, pk=parse_id(request.query_params['reassign_to'])).first()
+        error = category_merge_error([category], target)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        merge_categories(request.user, [category.pk], target)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+def category_merge_error(sources, target):
+    if target is None:
+        return CATEGEORY_ERRORS.CATEGORY_NOT_FOUND
+    if any(source.pk == target.pk for source in sources):
+        return CATEGEORY_ERRORS.MERGE_TARGET_IN_SOURCES
+    if any(source.type != target.type for source in sources):
+        return CATEGEORY_ERRORS.MERGE_TYPE_MISMATCH
+    return None
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def category_merge(request):
+    """
+    Move everything filed under the `sources` categories to `target` and
+    delete the sources (unless delete_sources is false). Budgets that
+    collide in a month are combined by summing their amounts.
+    """
+    data = request.data if isinstance(request.data, dict) else {}
+    if not isinstance(data.get('sources'), list) or not data['sources']:
+        return Response({'error': CATEGEORY_ERRORS.MERGE_SOURCES_REQUIRED}, status=status.HTTP_400_BAD_REQUEST)
+
+    source_ids = set(parse_ids(data['sources']))
+    target_id = parse_id(data.get('target'))
+    categories = Category.objects.filter(user=request.user, pk__in=[*source_ids, target_id]).in_bulk()
+    if len(parse_ids(data['sources'])) != len(data['sources']) or not source_ids.issubset(categories):
+        return Response({'error': CATEGEORY_ERRORS.CATEGORY_NOT_FOUND}, status=status.HTTP_400_BAD_REQUEST)
+
+    target = categories.get(target_id)
+    error = category_merge_error([categories[pk] for pk in source_ids], target)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    delete_sources = str(data.get('delete_sources', True)).lower() not in ('false', '0')
+    return Response(merge_categories(request.user, sorted(source_ids), target, delete_sources=delete_sources))
+
+class RecurringRuleListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    serializer_class = RecurringRuleSerializer
+    permission_classes = [IsAuthenticated]
+    lightweight_user = True
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['active', 'frequency', 'category']
+
+    def get_queryset(self):
+        return RecurringRule.objects.filter(user=self.request.user).select_related('category')
+
+class RecurringRuleDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = RecurringRuleSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+
+    def get_queryset(self):
+        return RecurringRule.objects.filter(user=self.request.user).select_related('category')
+
+class TransactionFilterMixin:
+    """
+    Filtering, search and ordering shared by the transaction list and export.
+    """
+    filter_backends = [DjangoFilterBackend, TransactionSearchFilter, TransactionOrderingFilter]
     filterset_fields = ['type', 'category']
     search_fields = ['title', 'description']
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date']
 
     def get_queryset(self):
-        queryset = Transaction.objects.filter(user=self.request.user)
-        
+        return self.filter_ranges(Transaction.objects.filter(user=self.request.user).select_related('category'))
+
+    def filter_ranges(self, queryset):
         date_from = self.request.query_params.get('date_from')
         date_to = self.request.query_params.get('date_to')
         
@@ -56,15 +145,280 @@ class TransactionListCreateView(generics.ListCreateAPIView):
             
         return queryset
 
-class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TransactionListCreateView(ConditionalGetMixin, TransactionFilterMixin, generics.ListCreateAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    lightweight_user = True
+    replica_reads = True
+
+    @property
+    def paginator(self):
+        # ?pagination=cursor (or a cursor from a previous page) switches to
+        # keyset pagination for infinite-scroll clients.
+        if not hasattr(self, '_paginator') and TransactionCursorPagination.is_requested(self.request):
+            self._paginator = TransactionCursorPagination()
+        return super().paginator
+
+    def list(self, request, *args, **kwargs):
+        # Reads go through values() and TransactionRowSerializer; writes keep
+        # the validating TransactionSerializer.
+        queryset = self.filter_queryset(self.get_queryset()).values(*TransactionRowSerializer.columns.values())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(TransactionRowSerializer(page, many=True).data)
+        return Response(TransactionRowSerializer(queryset, many=True).data)
+
+class TransactionExportView(TransactionFilterMixin, generics.GenericAPIView):
+    """
+    Stream every transaction matching the list filters as CSV or NDJSON.
+
+    ?output=csv|ndjson picks the format (?format is taken by DRF's content
+    negotiation) and ?compress=gzip compresses on the fly. Rows are read in
+    chunks from a database cursor, so memory stays flat for any export size.
+    Unless date_from is inside the live window, archived transactions follow
+    the live ones (search falls back to LIKE matching for them).
+    """
+    permission_classes = [IsAuthenticated]
+    lightweight_user = True
+    replica_reads = True
+
+    def get(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response({'error': TRANSACTION_ERRORS.UNSUPPORTED_EXPORT_FORMAT}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.query_params.get('compress') == 'gzip'
+
+        content_type, filename = export_file(output, compress)
+        # Resolve the read database now: the stream is consumed after the
+        # routing middleware has returned.
+        querysets = [queryset.using(queryset.db) for queryset in self.export_querysets()]
+        response = StreamingHttpResponse(export_stream(querysets, output, compress), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def export_querysets(self):
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if ArchivedTransaction in transaction_models(self.date_from()):
+            querysets.append(self.archived_queryset())
+        return querysets
+
+    def date_from(self):
+        try:
+            return parse_date(self.request.query_params.get('date_from', ''))
+        except ValueError:
+            return None
+
+    def archived_queryset(self):
+        queryset = self.filter_ranges(ArchivedTransaction.objects.filter(user=self.request.user))
+        for backend in (DjangoFilterBackend, SearchFilter, OrderingFilter):
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+class TransactionDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = TransactionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Transaction.objects.filter(user=self.request.user).select_related('category')
+
+def parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_ids(values):
+    return [pk for pk in map(parse_id, values) if pk is not None]
+
+class TransactionBulkView(generics.GenericAPIView):
+    """
+    Create (POST), partially update (PATCH) or delete (DELETE) many
+    transactions in one request.
+
+    Each request is all-or-nothing: if any item fails validation nothing is
+    written and the response lists the errors by item index.
+    """
+    serializer_class = BulkTransactionSerializer
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user)
 
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return None, Response({'error': TRANSACTION_ERRORS.BULK_PAYLOAD_MUST_BE_A_LIST}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BULK_TRANSACTION_LIMIT:
+            return None, Response({'error': TRANSACTION_ERRORS.BULK_LIMIT_EXCEEDED}, status=status.HTTP_400_BAD_REQUEST)
+        return items, None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # One query for every category referenced by the request.
+        items = self.request.data if isinstance(self.request.data, list) else []
+        category_ids = parse_ids(item.get('category') for item in items if isinstance(item, dict))
+        context['categories'] = Category.objects.filter(user=self.request.user).in_bulk(category_ids)
+        return context
+
+    def item_errors(self, errors):
+        return Response({
+            'errors': [{'index': index, 'errors': error} for index, error in enumerate(errors) if error]
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def post(self, request):
+        items, error_response = self.get_items(request)
+        if error_response:
+            return error_response
+
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            return self.item_errors(serializer.errors)
+
+        transactions = Transaction.objects.bulk_create(
+            [Transaction(user=request.user, **data) for data in serializer.validated_data],
+            batch_size=1000
+        )
+        return Response({
+            'created': len(transactions),
+            'results': TransactionSerializer(transactions, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        items, error_response = self.get_items(request)
+        if error_response:
+            return error_response
+
+        instances = self.get_queryset().select_related('category').in_bulk(
+            parse_ids(item.get('id') for item in items if isinstance(item, dict))
+        )
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        errors, updates, fields = [], [], set()
+        for item in items:
+            if not isinstance(item, dict) or 'id' not in item:
+                errors.append({'id': [TRANSACTION_ERRORS.ID_REQUIRED]})
+                continue
+            instance = instances.get(parse_id(item['id']))
+            if instance is None:
+                errors.append({'id': [TRANSACTION_ERRORS.TRANSACTION_NOT_FOUND]})
+                continue
+            serializer = serializer_class(instance, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            errors.append({})
+            updates.append((instance, serializer.validated_data))
+            fields.update(serializer.validated_data)
+
+        if any(errors):
+            return self.item_errors(errors)
+
+        now = timezone.now()
+        for instance, data in updates:
+            for field, value in data.items():
+                setattr(instance, field, value)
+            instance.updated_at = now
+
+        transactions = [instance for instance, _ in updates]
+        if fields:
+            Transaction.objects.bulk_update(transactions, sorted(fields) + ['updated_at'], batch_size=1000)
+        return Response({
+            'updated': len(transactions),
+            'results': TransactionSerializer(transactions, many=True).data
+        })
+
+    def delete(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            return Response({'error': TRANSACTION_ERRORS.ID_REQUIRED}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.BULK_TRANSACTION_LIMIT:
+            return Response({'error': TRANSACTION_ERRORS.BULK_LIMIT_EXCEEDED}, status=status.HTTP_400_BAD_REQUEST)
+
+        transactions = self.get_queryset().filter(id__in=parse_ids(ids))
+        found = set(transactions.values_list('id', flat=True))
+        errors = [
+            {} if parse_id(pk) in found else {'id': [TRANSACTION_ERRORS.TRANSACTION_NOT_FOUND]}
+            for pk in ids
+        ]
+        if any(errors):
+            return self.item_errors(errors)
+
+        deleted, _ = transactions.delete()
+        return Response({'deleted': deleted})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def import_transactions(request):
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': TRANSACTION_ERRORS.IMPORT_FILE_REQUIRED}, status=status.HTTP_400_BAD_REQUEST)
+
+    file_format = request.data.get('file_format') or detect_format(upload.name)
+    if file_format not in ('csv', 'ofx'):
+        return Response({'error': TRANSACTION_ERRORS.UNSUPPORTED_IMPORT_FORMAT}, status=status.HTTP_400_BAD_REQUEST)
+
+    importer = TransactionImporter(request.user, date_format=request.data.get('date_format'))
+    try:
+        stats = importer.run(read_rows(upload.file, file_format))
+    except UNREADABLE_FILE_ERRORS as exc:
+        return Response(
+            dict(importer.stats, error=TRANSACTION_ERRORS.UNREADABLE_IMPORT_FILE, detail=str(exc)),
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(stats, status=status.HTTP_201_CREATED if stats['imported'] else status.HTTP_200_OK)
+
+def summarize_transactions(*querysets, amount_field='amount'):
+    """
+    Income/expense totals and per-category breakdown, one grouped query per
+    queryset.
+
+    Works on Transaction, ArchivedTransaction or MonthlyRollup querysets;
+    amount_field names the column being summed.
+    """
+    categories = {}
+    for queryset in querysets:
+        rows = queryset.values(
+            'category_id', 'category__name', 'category__type', 'category__color'
+        ).annotate(
+            income=Sum(amount_field, filter=Q(type='income')),
+            expenses=Sum(amount_field, filter=Q(type='expense')),
+        ).order_by('category_id')
+
+        for row in rows:
+            category = categories.setdefault(row['category_id'], dict(row, income=0, expenses=0))
+            category['income'] += row['income'] or 0
+            category['expenses'] += row['expenses'] or 0
+
+    income_total = 0
+    expense_total = 0
+    category_breakdown = []
+
+    for category_id, row in sorted(categories.items()):
+        income = row['income']
+        expenses = row['expenses']
+        income_total += income
+        expense_total += expenses
+
+        category_total = income + expenses
+        if category_total > 0:
+            category_breakdown.append({
+                'id': category_id,
+                'name': row['category__name'],
+                'type': row['category__type'],
+                'color': row['category__color'],
+                'total': float(category_total)
+            })
+
+    return income_total, expense_total, category_breakdown
+
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get
+@cached_response('financial_summary')
 def financial_summary(request):
     user = request.user
     
@@ -77,34 +431,21 @@ def financial_summary(request):
     if isinstance(end_date, str):
         end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
     
-    transactions = Transaction.objects.filter(
-        user=user,
-        date__gte=start_date,
-        date__lte=end_date
-    )
-    
-    income_total = transactions.filter(type='income').aggregate(
-        total=Sum('amount'))['total'] or 0
-    expense_total = transactions.filter(type='expense').aggregate(
-        total=Sum('amount'))['total'] or 0
-    
+    months = whole_months(start_date, end_date) if settings.USE_MONTHLY_ROLLUPS else None
+    if months:
+        rollups = MonthlyRollup.objects.filter(period_filter(*months), user=user)
+        income_total, expense_total, category_breakdown = summarize_transactions(rollups, amount_field='total')
+    else:
+        income_total, expense_total, category_breakdown = summarize_transactions(*(
+            model.objects.filter(
+                user=user,
+                date__gte=start_date,
+                date__lte=end_date
+            )
+            for model in transaction_models(start_date)
+        ))
     balance = income_total - expense_total
     
-    category_breakdown = []
-    categories = Category.objects.filter(user=user)
-    
-    for category in categories:
-        category_total = transactions.filter(category=category).aggregate(
-            total=Sum('amount'))['total'] or 0
-        if category_total > 0:
-            category_breakdown.append({
-                'id': category.id,
-                'name': category.name,
-                'type': category.type,
-                'color': category.color,
-                'total': float(category_total)
-            })
-    
     return Response({
         'period': {
             'start_date': start_date,
@@ -116,4 +457,29 @@ def financial_summary(request):
             'balance': float(balance)
         },
         'category_breakdown': category_breakdown
-    })
\ No newline at end of file
+    })
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get
+@cached_response('transaction_trends')
+def transaction_trends(request):
+    interval = request.GET.get('interval', 'month')
+    if interval not in TREND_INTERVALS:
+        return Response({'error': TRANSACTION_ERRORS.INVALID_TRENDS_INTERVAL}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        end_date = request.GET.get('end_date')
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.today()
+        start_date = request.GET.get('start_date')
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else default_start(end_date, interval)
+    except ValueError:
+        return Response({'error': TRANSACTION_ERRORS.INVALID_DATE_RANGE}, status=status.HTTP_400_BAD_REQUEST)
+    if start_date > end_date:
+        return Response({'error': TRANSACTION_ERRORS.INVALID_DATE_RANGE}, status=status.HTTP_400_BAD_REQUEST)
+    if bucket_count(start_date, end_date, interval) > TRENDS_MAX_BUCKETS:
+        return Response({'error': TRANSACTION_ERRORS.TOO_MANY_TREND_BUCKETS}, status=status.HTTP_400_BAD_REQUEST)
+
+    by_category = request.GET.get('by_category', '').lower() in ('1', 'true', 'yes')
+    return Response(build_trends(request.user, start_date, end_date, interval, by_category))